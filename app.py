@@ -1,7 +1,13 @@
+import multiprocessing
+
 import customtkinter as ctk
 from ui.main_window import MainWindow
 
-ctk.set_appearance_mode("dark")
+# The guard keeps extraction worker processes (spawn start method) from opening their own window
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+    ctk.set_appearance_mode("dark")
 
-app = MainWindow()
-app.mainloop()
\ No newline at end of file
+    app = MainWindow()
+    app.mainloop()
@@ -0,0 +1,181 @@
+import mimetypes
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+# Local HTTP server for offline playback benchmarks
+# Serves audio files at /audio/<video_id> with HTTP Range support (206 / Content-Range), like googlevideo
+# Video IDs without a file of their own are mapped onto the fallback files, so any recording can be replayed
+# Optional first-byte delay and bandwidth cap emulate a slow network
+class AudioServer:
+    CHUNK_BYTES = 64 * 1024
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, str]] = None,
+        fallback_files: Optional[List[str]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        first_byte_delay_s: float = 0.0,
+        rate_bytes_s: Optional[int] = None
+    ):
+        self.routes = dict(routes or {})
+        self.fallback_files = list(fallback_files or [])
+        self.first_byte_delay_s = first_byte_delay_s
+        self.rate_bytes_s = rate_bytes_s
+
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="audio-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def resolve(self, video_id: str) -> Optional[str]:
+        path = self.routes.get(video_id)
+        if path:
+            return path
+
+        if not self.fallback_files:
+            return None
+
+        # Stable mapping, so the same video always gets the same file
+        return self.fallback_files[sum(video_id.encode("utf-8")) % len(self.fallback_files)]
+
+    def _count(self, sent: int):
+        with self._lock:
+            self.bytes_sent += sent
+
+
+def _make_handler(server: AudioServer):
+    range_pattern = re.compile(r"bytes=(\d*)-(\d*)$")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_HEAD(self):
+            self._serve(send_body=False)
+
+        def do_GET(self):
+            self._serve(send_body=True)
+
+        def _serve(self, send_body: bool):
+            with server._lock:
+                server.requests += 1
+
+            path = self.path.split("?", 1)[0]
+            if not path.startswith("/audio/"):
+                self.send_error(404)
+                return
+
+            file_path = server.resolve(path[len("/audio/"):])
+            if not file_path or not os.path.isfile(file_path):
+                self.send_error(404)
+                return
+
+            size = os.path.getsize(file_path)
+            start, end = 0, size - 1
+            status = 200
+
+            range_header = self.headers.get("Range")
+            if range_header:
+                match = range_pattern.match(range_header.strip())
+                if not match or (not match.group(1) and not match.group(2)):
+                    self._send_unsatisfiable(size)
+                    return
+
+                if match.group(1):
+                    start = int(match.group(1))
+                    if match.group(2):
+                        end = min(int(match.group(2)), size - 1)
+                else:
+                    # Suffix range: the last N bytes
+                    start = max(0, size - int(match.group(2)))
+
+                if start >= size or start > end:
+                    self._send_unsatisfiable(size)
+                    return
+
+                status = 206
+
+            if server.first_byte_delay_s > 0:
+                time.sleep(server.first_byte_delay_s)
+
+            length = end - start + 1
+            self.send_response(status)
+            self.send_header("Content-Type", mimetypes.guess_type(file_path)[0] or "application/octet-stream")
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Length", str(length))
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+
+            if send_body:
+                self._send_file(file_path, start, length)
+
+        def _send_file(self, file_path: str, start: int, length: int):
+            remaining = length
+            began = time.perf_counter()
+            sent = 0
+
+            try:
+                with open(file_path, "rb") as file:
+                    file.seek(start)
+
+                    while remaining > 0:
+                        chunk = file.read(min(server.CHUNK_BYTES, remaining))
+                        if not chunk:
+                            break
+
+                        self.wfile.write(chunk)
+                        remaining -= len(chunk)
+                        sent += len(chunk)
+
+                        if server.rate_bytes_s:
+                            ahead_s = sent / server.rate_bytes_s - (time.perf_counter() - began)
+                            if ahead_s > 0:
+                                time.sleep(ahead_s)
+
+            except (BrokenPipeError, ConnectionResetError):
+                # The player dropped the connection (seek, stop); normal for streaming clients
+                pass
+
+            finally:
+                server._count(sent)
+
+        def _send_unsatisfiable(self, size: int):
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    return Handler
@@ -0,0 +1,126 @@
+import argparse
+import csv
+import os
+import statistics
+import tempfile
+import time
+
+from core.csv_service import CSVService
+from core.journal_store import JournalPlaylistStore
+from core.sqlite_store import SQLitePlaylistStore, migrate_csv_to_sqlite
+
+# Benchmark: playlist add/remove cost with the indexed CSVService vs. the previous re-parse-everything approach
+# "legacy" re-parses the whole CSV for every next ID, removal and sidebar reload, as CSVService used to
+# "indexed" is the current service: one parse, then in-memory lookups and write-through updates
+# "journal" is JournalPlaylistStore seeded from the same CSV: every add/remove is a single appended line
+# "sqlite" is SQLitePlaylistStore (WAL) after migrating the same CSV
+# Each mutation is followed by load_playlists(), like the sidebar refresh after an add/remove
+# Run from the project root: python -m bench.bench_csv_service [--sizes 10000 100000 --ops 20]
+
+
+def _summarize(label: str, samples_ms):
+    samples_ms = sorted(samples_ms)
+    p95 = samples_ms[max(0, int(len(samples_ms) * 0.95) - 1)]
+    print(
+        f"{label:<22} n={len(samples_ms):<4} "
+        f"mean={statistics.mean(samples_ms):9.2f} ms  "
+        f"median={statistics.median(samples_ms):9.2f} ms  "
+        f"p95={p95:9.2f} ms"
+    )
+
+
+def _write_rows(path: str, count: int):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSVService.HEADERS)
+        for i in range(1, count + 1):
+            writer.writerow([i, f"Playlist {i}", f"https://music.youtube.com/playlist?list=PLbench{i:08d}"])
+
+
+# The pre-index implementation, kept here only as the baseline
+class _LegacyCSV:
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def load_playlists(self):
+        with open(self.file_path, "r", newline="", encoding="utf-8") as file:
+            return [(int(r["id"]), r["name"], r["url"]) for r in csv.DictReader(file)]
+
+    def add_playlist(self, name: str, url: str):
+        next_id = max((p[0] for p in self.load_playlists()), default=0) + 1
+        with open(self.file_path, "a", newline="", encoding="utf-8") as file:
+            csv.writer(file).writerow([next_id, name, url])
+        return next_id
+
+    def remove_playlist(self, playlist_id: int) -> bool:
+        playlists = self.load_playlists()
+        updated = [p for p in playlists if p[0] != playlist_id]
+        with open(self.file_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(CSVService.HEADERS)
+            writer.writerows(updated)
+        return len(updated) != len(playlists)
+
+
+def _time_ms(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def _bench(label: str, service, ops: int):
+    adds, removes = [], []
+
+    for i in range(ops):
+        elapsed, added = _time_ms(service.add_playlist, f"Bench {i}", f"https://music.youtube.com/playlist?list=PLnew{i}")
+        reload_ms, _ = _time_ms(service.load_playlists)
+        adds.append(elapsed + reload_ms)
+
+        added_id = added if isinstance(added, int) else added.id
+        elapsed, _ = _time_ms(service.remove_playlist, added_id)
+        reload_ms, _ = _time_ms(service.load_playlists)
+        removes.append(elapsed + reload_ms)
+
+    _summarize(f"{label} add+reload", adds)
+    _summarize(f"{label} remove+reload", removes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSVService add/remove at large playlist counts")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--ops", type=int, default=20, help="add/remove pairs per size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mirinoi-csv-") as tmp:
+        for size in args.sizes:
+            print(f"--- {size} playlists ---")
+
+            path = os.path.join(tmp, f"legacy_{size}.csv")
+            _write_rows(path, size)
+            _bench("legacy", _LegacyCSV(path), args.ops)
+
+            path = os.path.join(tmp, f"indexed_{size}.csv")
+            _write_rows(path, size)
+            open_ms, service = _time_ms(CSVService, path)
+            first_load_ms, _ = _time_ms(service.load_playlists)
+            print(f"{'indexed first load':<22} {open_ms + first_load_ms:9.2f} ms")
+            _bench("indexed", service, args.ops)
+
+            open_ms, journal = _time_ms(JournalPlaylistStore, os.path.join(tmp, f"seeded_{size}.journal"), path)
+            print(f"{'journal seed from csv':<22} {open_ms:9.2f} ms")
+            _bench("journal", journal, args.ops)
+            journal.close()
+
+            replay_ms, journal = _time_ms(JournalPlaylistStore, journal.file_path)
+            print(f"{'journal replay':<22} {replay_ms:9.2f} ms")
+            journal.close()
+
+            store = SQLitePlaylistStore(os.path.join(tmp, f"migrated_{size}.db"))
+            migrate_ms, _ = _time_ms(migrate_csv_to_sqlite, path, store)
+            print(f"{'sqlite migrate csv':<22} {migrate_ms:9.2f} ms")
+            _bench("sqlite", store, args.ops)
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from bench.audio_server import AudioServer
+from bench.fake_ydl import AUDIO_CODECS, FakeYdlFactory, Recording
+from core.audio_player import AudioPlayer
+from core.play_trace import PlayTracer
+from core.single_flight import SingleFlight
+from core.stream_cache import StreamUrlCache
+from core.ydl_pool import YdlPool
+from core.yt_service import YouTubeService
+
+# Offline end-to-end benchmark of the play pipeline: playlist load, play, next, seek and replay
+# yt-dlp is replaced by FakeYoutubeDL (recorded JSON + configurable latency) injected through the pool factory
+# Audio is streamed by VLC from a local AudioServer, so results are reproducible on a machine with no network
+# Without --recording, a playlist is synthesized from the files in --audio-dir
+# Run from the project root: python -m bench.bench_playback --audio-dir path/to/audio [--latency 0.3 --tracks 5]
+
+
+def _summarize(label: str, samples_ms):
+    if not samples_ms:
+        print(f"{label:<14} n=0")
+        return
+
+    samples_ms = sorted(samples_ms)
+    p95 = samples_ms[max(0, int(len(samples_ms) * 0.95) - 1)]
+    print(
+        f"{label:<14} n={len(samples_ms):<4} "
+        f"mean={statistics.mean(samples_ms):8.2f} ms  "
+        f"median={statistics.median(samples_ms):8.2f} ms  "
+        f"p95={p95:8.2f} ms"
+    )
+
+
+# PlayTracer that also wakes the benchmark up when a play reaches VLC's Playing event
+class _SignalingTracer(PlayTracer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.played = threading.Event()
+        self.last_outcome = None
+
+    def finish(self, trace, outcome):
+        super().finish(trace, outcome)
+        self.last_outcome = outcome
+        self.played.set()
+
+
+def _wait_until(predicate, timeout_s: float, poll_s: float = 0.005) -> bool:
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        time.sleep(poll_s)
+    return False
+
+
+def _timed_play(player: AudioPlayer, tracer: _SignalingTracer, url: str, timeout_s: float):
+    tracer.played.clear()
+    start = time.perf_counter()
+
+    # Same sequence as MainWindow._force_play_current
+    player.stop()
+    player.play(url)
+
+    if not tracer.played.wait(timeout_s) or tracer.last_outcome != "playing":
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+def _timed_seek(player: AudioPlayer, ratio: float, timeout_s: float):
+    if not _wait_until(lambda: player.get_track_duration_ms() > 0, timeout_s):
+        return None
+
+    target_ms = int(player.get_track_duration_ms() * ratio)
+    start = time.perf_counter()
+    player.seek_to_progress_ratio(ratio)
+
+    # Seek is done once playback time reports a position near the target
+    if not _wait_until(lambda: abs(player.get_current_playback_time_ms() - target_ms) < 1500, timeout_s):
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+def _load_recording(args):
+    if args.recording:
+        return Recording.load(args.recording), None
+
+    recording = Recording.synthesize(args.audio_dir)
+    return recording, next(iter(recording.playlists))
+
+
+def _audio_files(audio_dir: str):
+    return [
+        os.path.join(audio_dir, name)
+        for name in sorted(os.listdir(audio_dir))
+        if os.path.splitext(name)[1].lower() in AUDIO_CODECS
+    ]
+
+
+def run(args):
+    recording, playlist_id = _load_recording(args)
+    playlist_id = args.playlist or playlist_id or next(iter(recording.playlists), None)
+    if playlist_id is None:
+        raise SystemExit("recording has no playlist")
+
+    routes = {vid: v["_local_file"] for vid, v in recording.videos.items() if v.get("_local_file")}
+    server = AudioServer(
+        routes=routes,
+        fallback_files=_audio_files(args.audio_dir),
+        first_byte_delay_s=args.first_byte_delay,
+        rate_bytes_s=int(args.rate_kbps * 1000 / 8) if args.rate_kbps else None
+    )
+    base_url = server.start()
+
+    factory = FakeYdlFactory(recording, base_url, latency_s=args.latency, jitter_s=args.jitter, seed=args.seed)
+    pool = YdlPool(factory=factory)
+    single_flight = SingleFlight()
+    service = YouTubeService(ydl_pool=pool, single_flight=single_flight)
+
+    log_dir = tempfile.mkdtemp(prefix="mirinoi-bench-")
+    tracer = _SignalingTracer(os.path.join(log_dir, "play_trace.jsonl"))
+    player = AudioPlayer(stream_cache=StreamUrlCache(), ydl_pool=pool, tracer=tracer, single_flight=single_flight)
+
+    playlist_url = f"https://music.youtube.com/playlist?list={playlist_id}"
+
+    try:
+        start = time.perf_counter()
+        first_batch_ms = None
+        tracks = []
+        for batch in service.iter_playlist_batches(playlist_url):
+            if first_batch_ms is None:
+                first_batch_ms = (time.perf_counter() - start) * 1000
+            tracks.extend(batch)
+        full_load_ms = (time.perf_counter() - start) * 1000
+
+        if not tracks:
+            raise SystemExit("playlist is empty")
+
+        tracks = tracks[:args.tracks]
+
+        play_ms, seek_ms, replay_ms = [], [], []
+        failures = 0
+
+        for track in tracks:
+            elapsed = _timed_play(player, tracer, track.url, args.timeout)
+            if elapsed is None:
+                failures += 1
+                continue
+            play_ms.append(elapsed)
+
+            elapsed = _timed_seek(player, args.seek_ratio, args.timeout)
+            if elapsed is not None:
+                seek_ms.append(elapsed)
+
+            time.sleep(args.dwell)
+
+        # Second pass: stream URLs are cached now, so this measures the warm path
+        for track in tracks:
+            elapsed = _timed_play(player, tracer, track.url, args.timeout)
+            if elapsed is not None:
+                replay_ms.append(elapsed)
+            time.sleep(args.dwell)
+
+        print(f"playlist {playlist_id}: first batch {first_batch_ms:.1f} ms, full load {full_load_ms:.1f} ms")
+        _summarize("play/next", play_ms)
+        _summarize("seek", seek_ms)
+        _summarize("replay", replay_ms)
+        print(f"failed plays: {failures}")
+
+        for phase, stats in sorted(tracer.summary().items()):
+            print(f"  phase {phase:<14} p50={stats['p50']} p95={stats['p95']} ms (n={stats['count']})")
+
+        print(f"fake yt-dlp: {factory.calls} calls, {factory.instances} instances; pool {pool.stats()}")
+        print(f"single-flight: {single_flight.stats()}")
+        print(f"audio server: {server.requests} requests, {server.bytes_sent} bytes")
+        print(f"traces: {tracer.log_path}")
+
+    finally:
+        player.stop()
+        player.close()
+        tracer.close()
+        pool.close()
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline play/next/seek benchmark")
+    parser.add_argument("--audio-dir", required=True, help="folder with audio files served by the local server")
+    parser.add_argument("--recording", help="recorded JSON from bench.fake_ydl (default: synthesize from --audio-dir)")
+    parser.add_argument("--playlist", help="playlist ID inside the recording")
+    parser.add_argument("--tracks", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3, help="fake extraction latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--first-byte-delay", type=float, default=0.0, help="server delay before each response (s)")
+    parser.add_argument("--rate-kbps", type=float, default=0.0, help="server bandwidth cap (0 = unlimited)")
+    parser.add_argument("--seek-ratio", type=float, default=0.5)
+    parser.add_argument("--dwell", type=float, default=1.0, help="seconds to keep playing between steps")
+    parser.add_argument("--timeout", type=float, default=20.0)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from bench.fake_ydl import FakeYdlFactory, Recording
+from core.process_extractor import ProcessExtractor
+from core.ydl_pool import YdlPool
+
+# Benchmark: how much background extraction stalls the UI thread, thread pool vs. process pool backend
+# The main thread runs a heartbeat like Tk's after() loop and records how late each tick fires
+# Background threads keep extracting through the chosen backend, as the loader and job scheduler do in the app
+# FakeYoutubeDL burns CPU with the GIL held (--cpu-ms per call), so the results do not depend on the network
+# Run from the project root: python -m bench.bench_ui_stall [--cpu-ms 80 --threads 3 --seconds 5]
+
+
+def _summarize(label: str, lateness_ms, extractions: int, seconds: float):
+    lateness_ms = sorted(lateness_ms)
+    p99 = lateness_ms[max(0, int(len(lateness_ms) * 0.99) - 1)]
+    stalls = sum(1 for x in lateness_ms if x > 50)
+    print(
+        f"{label:<8} ticks={len(lateness_ms):<5} "
+        f"median={statistics.median(lateness_ms):7.2f} ms  "
+        f"p99={p99:7.2f} ms  max={lateness_ms[-1]:7.2f} ms  "
+        f"stalls>50ms={stalls:<4} extractions/s={extractions / seconds:6.1f}"
+    )
+
+
+def _heartbeat(seconds: float, interval_s: float):
+    lateness = []
+    deadline = time.perf_counter() + seconds
+    expected = time.perf_counter() + interval_s
+
+    while expected < deadline:
+        time.sleep(max(0.0, expected - time.perf_counter()))
+        lateness.append((time.perf_counter() - expected) * 1000)
+        expected = time.perf_counter() + interval_s
+
+    return lateness
+
+
+def _run(backend, urls, threads: int, seconds: float, interval_s: float):
+    stop = threading.Event()
+    count = [0]
+    lock = threading.Lock()
+
+    def worker(offset):
+        i = offset
+        while not stop.is_set():
+            backend.extract_info({"quiet": True}, urls[i % len(urls)])
+            i += 1
+            with lock:
+                count[0] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(threads)]
+    for w in workers:
+        w.start()
+
+    try:
+        return _heartbeat(seconds, interval_s), count[0]
+    finally:
+        stop.set()
+        for w in workers:
+            w.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UI-thread stall: thread vs. process extraction backend")
+    parser.add_argument("--cpu-ms", type=float, default=80.0, help="GIL-holding CPU time per fake extraction")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake network latency per extraction (s)")
+    parser.add_argument("--threads", type=int, default=3, help="concurrent background extraction threads")
+    parser.add_argument("--workers", type=int, default=2, help="process pool size")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--interval-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    # Any audio file works; the stall benchmark never streams
+    audio_dir = tempfile.mkdtemp(prefix="mirinoi-stall-")
+    for i in range(8):
+        with open(os.path.join(audio_dir, f"track_{i}.opus"), "wb") as file:
+            file.write(b"\0" * 1024)
+
+    recording = Recording.synthesize(audio_dir)
+    urls = [f"https://music.youtube.com/watch?v={vid}" for vid in recording.videos]
+    factory = FakeYdlFactory(recording, "http://127.0.0.1", latency_s=args.latency, cpu_ms=args.cpu_ms)
+    interval_s = args.interval_ms / 1000
+
+    baseline = _heartbeat(min(args.seconds, 2.0), interval_s)
+    _summarize("idle", baseline, 0, args.seconds)
+
+    pool = YdlPool(factory=factory)
+    lateness, extractions = _run(pool, urls, args.threads, args.seconds, interval_s)
+    _summarize("threads", lateness, extractions, args.seconds)
+    pool.close()
+
+    extractor = ProcessExtractor(args.workers, factory=factory, warm_opts=[{"quiet": True}])
+    lateness, extractions = _run(extractor, urls, args.threads, args.seconds, interval_s)
+    _summarize("process", lateness, extractions, args.seconds)
+    print(f"process backend: {extractor.stats()}")
+    extractor.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import statistics
+import tempfile
+import time
+
+from bench.fake_ydl import FakeYdlFactory, Recording
+from core.job_scheduler import JobScheduler
+from core.playlist_warmup import PlaylistWarmup
+from core.track_cache import TrackCache
+from core.ydl_pool import YdlPool
+from core.yt_service import YouTubeService
+from models.playlist import Playlist
+from utils.validators import KIND_PLAYLIST, canonical_key
+
+# Regression benchmark: time to the first batch of a clicked playlist while the playlist warm-up is running
+# Synthesizes paged playlists with fake latency, so every warm-up extraction keeps its YoutubeDL busy for seconds
+# The clicked playlist streams through iter_playlist_batches on the same pool, like MainWindow's foreground load
+# Without a free playlist slot the first batch waits for a whole warm-up playlist (~pages * latency)
+# Run from the project root: python -m bench.bench_warmup [--latency 0.25 --pages 12 --runs 3]
+
+
+def _make_recording(playlists: int, entries: int) -> Recording:
+    recording = Recording()
+
+    for p in range(playlists + 1):
+        playlist_id = f"PLwarm{p:04d}"
+        recording.playlists[playlist_id] = {
+            "id": playlist_id,
+            "title": f"Playlist {p}",
+            "entries": [
+                {"id": f"v{p:04d}{i:06d}", "title": f"Track {p}-{i}", "channel": "Bench"}
+                for i in range(entries)
+            ],
+        }
+
+    return recording
+
+
+def _playlist_url(playlist_id: str) -> str:
+    return f"https://music.youtube.com/playlist?list={playlist_id}"
+
+
+def _first_batch_s(yt_service: YouTubeService, url: str) -> float:
+    start = time.perf_counter()
+    batches = yt_service.iter_playlist_batches(url)
+    try:
+        next(batches)
+    finally:
+        batches.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Foreground playlist load latency during the playlist warm-up")
+    parser.add_argument("--latency", type=float, default=0.25, help="fake latency per request/page (s)")
+    parser.add_argument("--pages", type=int, default=12, help="pages per playlist")
+    parser.add_argument("--playlists", type=int, default=4, help="playlists to warm up")
+    parser.add_argument("--concurrency", type=int, default=2, help="requested warm-up concurrency")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    page_size = 100
+    recording = _make_recording(args.playlists, args.pages * page_size)
+    factory = FakeYdlFactory(recording, latency_s=args.latency, page_size=page_size)
+
+    warm = [Playlist(i, f"Playlist {i}", _playlist_url(f"PLwarm{i:04d}")) for i in range(args.playlists)]
+    clicked_url = _playlist_url(f"PLwarm{args.playlists:04d}")
+
+    idle, during = [], []
+
+    for _ in range(args.runs):
+        pool = YdlPool(factory=factory)
+        yt_service = YouTubeService(ydl_pool=pool)
+        scheduler = JobScheduler()
+        track_cache = TrackCache(tempfile.mkdtemp(prefix="mirinoi-warmup-") + "/tracks.db")
+        warmup = PlaylistWarmup(
+            yt_service,
+            track_cache,
+            scheduler,
+            key_fn=lambda url: canonical_key(url, KIND_PLAYLIST)[1],
+            concurrency=args.concurrency
+        )
+
+        idle.append(_first_batch_s(yt_service, clicked_url))
+
+        warmup.start(warm)
+        # Let the warm-up jobs check out their instances and start paging
+        time.sleep(args.latency * 2)
+        during.append(_first_batch_s(yt_service, clicked_url))
+
+        warmup.cancel()
+        scheduler.shutdown()
+        track_cache.close()
+        pool.close()
+
+    playlist_s = args.latency * (args.pages + 1)
+    print(f"warm-up jobs={warmup.concurrency} (requested {args.concurrency}), pool slots={yt_service.playlist_slots}")
+    print(f"one full playlist extraction ~{playlist_s:.2f} s")
+    print(f"first batch idle        median={statistics.median(idle):6.2f} s  max={max(idle):6.2f} s")
+    print(f"first batch during warm median={statistics.median(during):6.2f} s  max={max(during):6.2f} s")
+
+    # Waiting for a free instance would cost most of a warm-up playlist; a free slot costs about one request
+    verdict = "OK" if max(during) < max(idle) + args.latency * 2 else "BLOCKED"
+    print(f"foreground during warm-up: {verdict}")
+
+
+if __name__ == "__main__":
+    main()
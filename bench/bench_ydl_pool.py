@@ -0,0 +1,90 @@
+import argparse
+import statistics
+import time
+from yt_dlp import YoutubeDL
+
+from core.ydl_pool import YdlPool
+
+# Micro-benchmark: per-call overhead of a fresh YoutubeDL per call vs. a pooled, long-lived instance
+# "construct" mode measures only the setup cost (no network)
+# "extract" mode runs a real extract_info against --url, so TLS/session reuse shows up as well
+# Run from the project root: python -m bench.bench_ydl_pool [--mode extract --url URL]
+
+OPTS = {
+    "format": "bestaudio/best",
+    "quiet": True,
+    "no_warnings": True,
+    "noplaylist": True,
+    "skip_download": True,
+}
+
+
+def _summarize(label: str, samples_ms):
+    samples_ms = sorted(samples_ms)
+    p95 = samples_ms[max(0, int(len(samples_ms) * 0.95) - 1)]
+    print(
+        f"{label:<10} n={len(samples_ms):<4} "
+        f"mean={statistics.mean(samples_ms):8.2f} ms  "
+        f"median={statistics.median(samples_ms):8.2f} ms  "
+        f"p95={p95:8.2f} ms"
+    )
+
+
+def bench_construct(iterations: int):
+    fresh = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        with YoutubeDL(dict(OPTS)):
+            pass
+        fresh.append((time.perf_counter() - start) * 1000)
+
+    pool = YdlPool()
+    pooled = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        slot = pool._acquire(OPTS)
+        pool._release(slot)
+        pooled.append((time.perf_counter() - start) * 1000)
+
+    _summarize("fresh", fresh)
+    _summarize("pooled", pooled)
+    print(f"pool stats: {pool.stats()}")
+    pool.close()
+
+
+def bench_extract(iterations: int, url: str):
+    fresh = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        with YoutubeDL(dict(OPTS)) as ydl:
+            ydl.extract_info(url, download=False)
+        fresh.append((time.perf_counter() - start) * 1000)
+
+    pool = YdlPool()
+    pooled = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        pool.extract_info(OPTS, url)
+        pooled.append((time.perf_counter() - start) * 1000)
+
+    _summarize("fresh", fresh)
+    _summarize("pooled", pooled)
+    print(f"pool stats: {pool.stats()}")
+    pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YoutubeDL pool micro-benchmark")
+    parser.add_argument("--mode", choices=("construct", "extract"), default="construct")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--url", default="https://music.youtube.com/watch?v=dQw4w9WgXcQ")
+    args = parser.parse_args()
+
+    if args.mode == "construct":
+        bench_construct(args.iterations)
+    else:
+        bench_extract(args.iterations, args.url)
+
+
+if __name__ == "__main__":
+    main()
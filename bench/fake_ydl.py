@@ -0,0 +1,323 @@
+import argparse
+import copy
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+from utils.validators import extract_playlist_id, extract_video_id
+
+# Offline stand-in for yt_dlp.YoutubeDL, for reproducible benchmarks
+# Answers extract_info() from a recording (videos, playlists, searches) after a configurable latency
+# Can also burn CPU while holding the GIL (large json.loads calls), to emulate yt-dlp's parsing cost
+# Format URLs are rewritten to point at a local AudioServer, so the player streams real audio without network
+# Plug it in through the pool factory: YdlPool(factory=FakeYdlFactory(recording, ...))
+# A recording can be captured from live YouTube ("record") or synthesized from a folder of audio files
+# Run from the project root: python -m bench.fake_ydl record URL [URL ...] --out bench/recordings/sample.json
+
+AUDIO_CODECS = {
+    ".opus": "opus",
+    ".webm": "opus",
+    ".ogg": "vorbis",
+    ".m4a": "mp4a.40.2",
+    ".aac": "mp4a.40.2",
+    ".mp3": "mp3",
+}
+
+FLAT_KEYS = ("id", "title", "artist", "uploader", "channel", "duration", "thumbnails")
+FORMAT_KEYS = ("format_id", "ext", "acodec", "vcodec", "abr", "tbr", "filesize", "filesize_approx", "url")
+
+
+class FakeExtractionError(Exception):
+    pass
+
+
+# Recorded extractor output, keyed by video ID, playlist ID and normalized search query
+class Recording:
+    def __init__(self, videos: Optional[Dict] = None, playlists: Optional[Dict] = None, searches: Optional[Dict] = None):
+        self.videos = videos or {}
+        self.playlists = playlists or {}
+        self.searches = searches or {}
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+
+        return cls(data.get("videos"), data.get("playlists"), data.get("searches"))
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"videos": self.videos, "playlists": self.playlists, "searches": self.searches},
+                file,
+                ensure_ascii=False,
+                indent=1
+            )
+
+    @classmethod
+    def synthesize(cls, audio_dir: str, playlist_id: str = "PLbench") -> "Recording":
+        # One video per audio file plus a playlist holding all of them; the file path travels in "_local_file"
+        recording = cls()
+        entries = []
+
+        for name in sorted(os.listdir(audio_dir)):
+            path = os.path.join(audio_dir, name)
+            ext = os.path.splitext(name)[1].lower()
+            if not os.path.isfile(path) or ext not in AUDIO_CODECS:
+                continue
+
+            video_id = _synthetic_video_id(name)
+            title = os.path.splitext(name)[0]
+
+            recording.videos[video_id] = {
+                "id": video_id,
+                "title": title,
+                "channel": "Local",
+                "_local_file": os.path.abspath(path),
+                "formats": [{
+                    "format_id": "local",
+                    "ext": ext.lstrip("."),
+                    "acodec": AUDIO_CODECS[ext],
+                    "vcodec": "none",
+                    "abr": 128,
+                    "filesize": os.path.getsize(path),
+                    "url": "",
+                }],
+            }
+            entries.append({"id": video_id, "title": title, "channel": "Local"})
+
+        recording.playlists[playlist_id] = {"id": playlist_id, "title": "Bench playlist", "entries": entries}
+        return recording
+
+    def video_ids(self) -> List[str]:
+        return list(self.videos.keys())
+
+
+# Callable passed to YdlPool(factory=...); every instance it builds shares the recording and the counters
+class FakeYdlFactory:
+    def __init__(
+        self,
+        recording: Recording,
+        audio_base_url: str = "",
+        latency_s: float = 0.3,
+        jitter_s: float = 0.0,
+        page_size: int = 100,
+        seed: Optional[int] = None,
+        cpu_ms: float = 0.0
+    ):
+        self.recording = recording
+        self.audio_base_url = audio_base_url.rstrip("/")
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.page_size = page_size
+        self.cpu_ms = cpu_ms
+        self._cpu_payload = None
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.instances = 0
+        self.calls = 0
+
+    # Picklable, so the factory can be handed to process-pool workers (each gets its own counters)
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __call__(self, opts: dict) -> "FakeYoutubeDL":
+        with self._lock:
+            self.instances += 1
+        return FakeYoutubeDL(opts, self)
+
+    def sleep(self):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency_s + (self._random.uniform(0, self.jitter_s) if self.jitter_s else 0.0)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.cpu_ms > 0:
+            self._burn_cpu()
+
+    def _burn_cpu(self):
+        # json.loads runs in C without releasing the GIL, like the big player/response parses in yt-dlp
+        if self._cpu_payload is None:
+            self._cpu_payload = json.dumps([{"id": i, "title": "x" * 40, "formats": list(range(20))} for i in range(5000)])
+
+        deadline = time.perf_counter() + self.cpu_ms / 1000
+        while time.perf_counter() < deadline:
+            json.loads(self._cpu_payload)
+
+
+class FakeYoutubeDL:
+    def __init__(self, opts: dict, factory: FakeYdlFactory):
+        self.params = dict(opts or {})
+        self._factory = factory
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        pass
+
+    def extract_info(self, url: str, download: bool = False, process: bool = True) -> dict:
+        self._factory.sleep()
+        recording = self._factory.recording
+
+        if url.startswith("ytsearch"):
+            return self._search(url.split(":", 1)[1] if ":" in url else url)
+
+        video_id = extract_video_id(url)
+        playlist_id = extract_playlist_id(url)
+
+        if playlist_id and (not video_id or not self.params.get("noplaylist")):
+            playlist = recording.playlists.get(playlist_id)
+            if playlist is None:
+                raise FakeExtractionError(f"playlist not recorded: {playlist_id}")
+            return self._playlist(playlist, process)
+
+        if video_id:
+            video = recording.videos.get(video_id)
+            if video is None:
+                raise FakeExtractionError(f"video not recorded: {video_id}")
+            return self._video(video)
+
+        raise FakeExtractionError(f"unsupported url: {url}")
+
+    def _playlist(self, playlist: dict, process: bool) -> dict:
+        info = {k: v for k, v in playlist.items() if k != "entries"}
+        entries = playlist.get("entries") or []
+
+        if process:
+            info["entries"] = [copy.deepcopy(e) for e in entries]
+        else:
+            # Lazy like yt-dlp's paged playlists: every page costs one more round of latency
+            info["entries"] = self._paged_entries(entries)
+
+        return info
+
+    def _paged_entries(self, entries: List[dict]):
+        for i, entry in enumerate(entries):
+            if i and i % self._factory.page_size == 0:
+                self._factory.sleep()
+            yield copy.deepcopy(entry)
+
+    def _video(self, video: dict) -> dict:
+        info = {k: copy.deepcopy(v) for k, v in video.items() if not k.startswith("_")}
+
+        for fmt in info.get("formats") or []:
+            fmt["url"] = f"{self._factory.audio_base_url}/audio/{info['id']}?format_id={fmt.get('format_id', '')}"
+
+        return info
+
+    def _search(self, query: str) -> dict:
+        recording = self._factory.recording
+        normalized = " ".join(query.split()).casefold()
+
+        video_id = recording.searches.get(normalized)
+        if video_id is None:
+            video_id = next(
+                (vid for vid, v in recording.videos.items() if normalized in (v.get("title") or "").casefold()),
+                None
+            )
+
+        entries = []
+        if video_id in recording.videos:
+            video = recording.videos[video_id]
+            entries.append({k: video.get(k) for k in FLAT_KEYS if video.get(k) is not None})
+
+        return {"_type": "playlist", "id": normalized, "entries": entries}
+
+
+def _synthetic_video_id(name: str) -> str:
+    # 11 URL-safe characters, like a real YouTube video ID
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    digest = hashlib.sha1(name.encode("utf-8")).digest()
+    return "".join(alphabet[b % 64] for b in digest[:11])
+
+
+def record(urls: List[str], out_path: str, max_videos: int = 50):
+    from yt_dlp import YoutubeDL
+
+    recording = Recording.load(out_path) if os.path.exists(out_path) else Recording()
+    opts = {"quiet": True, "no_warnings": True, "skip_download": True}
+    video_urls = []
+
+    with YoutubeDL({**opts, "extract_flat": True, "noplaylist": False}) as ydl:
+        for url in urls:
+            playlist_id = extract_playlist_id(url)
+            if not playlist_id or extract_video_id(url):
+                video_urls.append(url)
+                continue
+
+            info = ydl.extract_info(url, download=False)
+            entries = [
+                {k: e.get(k) for k in FLAT_KEYS if e.get(k) is not None}
+                for e in info.get("entries") or []
+                if isinstance(e, dict) and e.get("id")
+            ]
+            recording.playlists[playlist_id] = {"id": playlist_id, "title": info.get("title"), "entries": entries}
+            video_urls.extend(f"https://music.youtube.com/watch?v={e['id']}" for e in entries[:max_videos])
+
+    with YoutubeDL({**opts, "format": "bestaudio/best", "noplaylist": True}) as ydl:
+        for url in video_urls:
+            try:
+                info = ydl.extract_info(url, download=False)
+            except Exception as e:
+                print(f"skipped {url}: {e}")
+                continue
+
+            video = {k: info.get(k) for k in FLAT_KEYS if info.get(k) is not None}
+            # Stream URLs expire anyway; replay points them at the local server
+            video["formats"] = [
+                {k: f.get(k) for k in FORMAT_KEYS if f.get(k) is not None}
+                for f in info.get("formats") or []
+                if f.get("acodec") not in (None, "none")
+            ]
+            recording.videos[info["id"]] = video
+
+    recording.save(out_path)
+    print(f"recorded {len(recording.videos)} videos, {len(recording.playlists)} playlists -> {out_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record yt-dlp output for offline benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="capture playlists/videos from live YouTube")
+    rec.add_argument("urls", nargs="+")
+    rec.add_argument("--out", default="bench/recordings/recording.json")
+    rec.add_argument("--max-videos", type=int, default=50)
+
+    syn = sub.add_parser("synthesize", help="build a recording from a folder of audio files")
+    syn.add_argument("audio_dir")
+    syn.add_argument("--out", default="bench/recordings/local.json")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.urls, args.out, args.max_videos)
+    else:
+        recording = Recording.synthesize(args.audio_dir)
+        recording.save(args.out)
+        print(f"synthesized {len(recording.videos)} videos -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# Size-bounded on-disk cache of downloaded audio, keyed by YouTube video ID
+# Files are content-addressed by a hash of the video ID and fanned out into subdirectories
+# Downloads run in the background (one at a time) while the first play streams from the network
+# Partial downloads are written to a ".part" file and only renamed into place once complete
+# Evicts entries with the LRU or LFU policy when the byte budget is exceeded
+# Keeps a small JSON index with sizes and access statistics
+class AudioDiskCache:
+    INDEX_FILE = "index.json"
+    CHUNK_BYTES = 10 * 1024 * 1024
+    USER_AGENT = "Mozilla/5.0"
+    POLICIES = ("lru", "lfu")
+
+    def __init__(self, directory: str = "cache/audio", max_bytes: int = 2 * 1024 ** 3, policy: str = "lru"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.policy = policy
+
+        self._entries = {}
+        self._in_progress = set()
+        self._lock = threading.Lock()
+        self._downloader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-cache")
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    def get_path(self, video_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            path = self._path_for(video_id)
+            if not os.path.exists(path):
+                del self._entries[video_id]
+                self.misses += 1
+                return None
+
+            entry["last_access"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+            self.hits += 1
+            return path
+
+    def contains(self, video_id: str) -> bool:
+        with self._lock:
+            return video_id in self._entries
+
+    def fetch_async(self, video_id: str, stream_url: str):
+        with self._lock:
+            if video_id in self._entries or video_id in self._in_progress:
+                return
+            self._in_progress.add(video_id)
+
+        self._downloader.submit(self._download, video_id, stream_url)
+
+    def remove(self, video_id: str):
+        with self._lock:
+            self._entries.pop(video_id, None)
+            self._remove_file(self._path_for(video_id))
+            self._save_index()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def close(self):
+        self._downloader.shutdown(wait=False, cancel_futures=True)
+
+        with self._lock:
+            self._save_index()
+
+    def _download(self, video_id: str, stream_url: str):
+        path = self._path_for(video_id)
+        part_path = path + ".part"
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            size = self._download_to(stream_url, part_path)
+
+            if size <= 0 or size > self.max_bytes:
+                self._remove_file(part_path)
+                return
+
+            os.replace(part_path, path)
+
+            with self._lock:
+                now = time.time()
+                self._entries[video_id] = {
+                    "size": size,
+                    "created": now,
+                    "last_access": now,
+                    "hits": 0,
+                }
+                self._evict_over_budget(keep=video_id)
+                self._save_index()
+
+        except Exception:
+            self._remove_file(part_path)
+
+        finally:
+            with self._lock:
+                self._in_progress.discard(video_id)
+
+    def _download_to(self, stream_url: str, target_path: str) -> int:
+        # googlevideo throttles single large responses, so fetch the file in ranged chunks
+        written = 0
+        total = None
+
+        with open(target_path, "wb") as file:
+            while total is None or written < total:
+                end = written + self.CHUNK_BYTES - 1
+                request = urllib.request.Request(
+                    stream_url,
+                    headers={"User-Agent": self.USER_AGENT, "Range": f"bytes={written}-{end}"}
+                )
+
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    content_range = response.headers.get("Content-Range")
+                    if content_range and "/" in content_range:
+                        total_part = content_range.rsplit("/", 1)[1]
+                        if total_part.isdigit():
+                            total = int(total_part)
+
+                    chunk = response.read()
+
+                if not chunk:
+                    break
+
+                file.write(chunk)
+                written += len(chunk)
+
+                if total is None:
+                    # Server ignored the Range header and sent the whole file
+                    break
+
+        return written
+
+    def _evict_over_budget(self, keep: str):
+        while self._total_bytes() > self.max_bytes:
+            candidates = [vid for vid in self._entries if vid != keep]
+            if not candidates:
+                return
+
+            if self.policy == "lfu":
+                victim = min(
+                    candidates,
+                    key=lambda vid: (self._entries[vid].get("hits", 0), self._entries[vid].get("last_access", 0))
+                )
+            else:
+                victim = min(candidates, key=lambda vid: self._entries[vid].get("last_access", 0))
+
+            del self._entries[victim]
+            self._remove_file(self._path_for(victim))
+
+    def _total_bytes(self) -> int:
+        return sum(entry.get("size", 0) for entry in self._entries.values())
+
+    def _path_for(self, video_id: str) -> str:
+        digest = hashlib.sha1(video_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".audio")
+
+    def _load_index(self):
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            data = {}
+
+        if not isinstance(data, dict):
+            data = {}
+
+        for video_id, entry in data.items():
+            if isinstance(entry, dict) and os.path.exists(self._path_for(video_id)):
+                self._entries[video_id] = entry
+
+    def _save_index(self):
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        tmp_path = index_path + ".tmp"
+
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self._entries, file)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+
+    def _remove_file(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,25 +1,88 @@
+import queue
 import threading
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from typing import NamedTuple
 import vlc
-from yt_dlp import YoutubeDL
+
+from core.audio_cache import AudioDiskCache
+from core.circuit_breaker import CircuitBreaker, get_shared_circuit_breaker
+from core.format_selector import FormatSelector, QualityProfile
+from core.negative_cache import NegativeCache, UnplayableVideoError, classify_extraction_error, is_transient_error
+from core.play_trace import PlayTracer
+from core.single_flight import SingleFlight, get_shared_single_flight
+from core.stream_cache import StreamUrlCache
+from core.ydl_pool import YdlPool, get_shared_pool
+from utils.validators import canonical_key, extract_video_id
 
 class PlayerState(Enum):
     STOPPED = "stopped"
     PLAYING = "playing"
     PAUSED = "paused"
 
+# Immutable view of the playback state, read under a single lock acquisition
+class PlaybackSnapshot(NamedTuple):
+    state: PlayerState
+    current_time_ms: int
+    track_duration_ms: int
+    progress_ratio: float
+    volume: int
+
 # Audio player class
 # Manages audio playback using VLC
 # Supports play, pause, and stop functionalities
 # Calls a callback function when playback finishes naturally
-# Uses threading to handle playback in the background
-# Monitors real VLC playback state to avoid false track endings
+# Tracks playback state from libVLC events instead of polling get_state()
+# VLC callbacks only enqueue events; a single dispatcher thread applies them under the lock
+# Stream URL resolution runs on one long-lived loader thread, never on the UI thread
+# Caches resolved stream URLs per video ID so replays skip yt-dlp extraction
+# Runs extractions on pooled YoutubeDL instances shared with the YouTube service
+# Concurrent extractions of the same video (e.g. a play racing a prefetch) share one yt-dlp call
+# Remembers unplayable videos (private, removed, region-blocked...) in a negative cache and skips them without extracting
+# Extractions go through a global circuit breaker that fails fast after repeated transient errors
+# Plays tracks from the optional on-disk audio cache when available, and fills it while a track actually plays
+# (standby preloads only stream, so skipped tracks are never downloaded)
+# Optionally records per-play phase timings (time to first audio) through a PlayTracer
+# Picks the stream format through a FormatSelector (quality profile / fast start)
+# Keeps a second VLC player on standby with the next track preloaded (paused)
+# Switches to the standby player at end-of-track, either gaplessly or with a crossfade
+# Tells a real end-of-media apart from a dropped or expired stream and recovers from the latter:
+# the URL is re-resolved (bypassing the caches) and playback resumes at the last known position,
+# within a per-track retry budget with exponential backoff
 class AudioPlayer:
-    def __init__(self):
+    FADE_STEP_MS = 50
+
+    MAX_RECOVERY_ATTEMPTS = 4
+    RECOVERY_BACKOFF_S = 1.0
+    RECOVERY_MAX_BACKOFF_S = 15.0
+    RECOVERY_RESET_MS = 30000
+    TRUNCATED_END_TOLERANCE_MS = 3000
+
+    STREAM_YDL_OPTS = {
+        "format": "bestaudio/best",
+        "quiet": True,
+        "no_warnings": True,
+        "noplaylist": True,
+        "skip_download": True,
+    }
+
+    def __init__(
+        self,
+        stream_cache: StreamUrlCache | None = None,
+        crossfade_ms: int = 0,
+        ydl_pool: YdlPool | None = None,
+        audio_cache: AudioDiskCache | None = None,
+        tracer: PlayTracer | None = None,
+        format_selector: FormatSelector | None = None,
+        single_flight: SingleFlight | None = None,
+        negative_cache: NegativeCache | None = None,
+        circuit_breaker: CircuitBreaker | None = None
+    ):
         self.instance = vlc.Instance("--no-video")
         self.player = self.instance.media_player_new()
+        self._standby_player = self.instance.media_player_new()
 
         self.current_url = None
         self.state = PlayerState.STOPPED
@@ -28,9 +91,46 @@ class AudioPlayer:
         self._play_id = 0
         self._stop_requested = False
         self._paused_time_ms = 0
+        self._started = False
+        self._pending_seek_ms = 0
+
+        self._last_position_ms = 0
+        self._recovery_attempts = 0
+        self._recovery_position_ms = 0
 
         self.on_finished = None
 
+        self.stream_cache = stream_cache if stream_cache is not None else StreamUrlCache()
+        self._ydl_pool = ydl_pool if ydl_pool is not None else get_shared_pool()
+        self._single_flight = single_flight if single_flight is not None else get_shared_single_flight()
+        self.negative_cache = negative_cache if negative_cache is not None else NegativeCache()
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else get_shared_circuit_breaker()
+        self.audio_cache = audio_cache
+        self.tracer = tracer
+        self._trace = None
+
+        self.format_selector = format_selector if format_selector is not None else FormatSelector()
+        self.last_format = None
+
+        self.crossfade_ms = max(0, int(crossfade_ms))
+        self._preloaded_url = None
+        self._preload_pending_url = None
+        self._preload_id = 0
+        self._deferred_preload_url = None
+        self._standby_busy = False
+        self._handoff_pending = False
+        self._fade_in_id = 0
+        self._fading_in = False
+
+        self._media_epochs = {}
+        self._events = queue.Queue()
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-loader")
+        self._event_thread = threading.Thread(target=self._event_loop, daemon=True)
+        self._event_thread.start()
+
+        for player in (self.player, self._standby_player):
+            self._attach_events(player)
+
         self._volume = 20
 
         self._last_known_track_duration_ms = 0
@@ -41,35 +141,270 @@ class AudioPlayer:
 
         self._last_known_track_duration_ms = 0    
 
+    def _attach_events(self, player):
+        self._media_epochs[id(player)] = 0
+
+        manager = player.event_manager()
+        for event_type in (
+            vlc.EventType.MediaPlayerPlaying,
+            vlc.EventType.MediaPlayerPaused,
+            vlc.EventType.MediaPlayerEndReached,
+            vlc.EventType.MediaPlayerEncounteredError,
+            vlc.EventType.MediaPlayerLengthChanged,
+            vlc.EventType.MediaPlayerTimeChanged,
+        ):
+            manager.event_attach(event_type, self._on_vlc_event, player)
+
+    def _bump_media_epoch(self, player):
+        self._media_epochs[id(player)] = self._media_epochs.get(id(player), 0) + 1
+
+    def _on_vlc_event(self, event, player):
+        # Runs on a libVLC thread: never take the lock or call back into libVLC here
+        payload = None
+        if event.type == vlc.EventType.MediaPlayerLengthChanged:
+            payload = event.u.new_length
+        elif event.type == vlc.EventType.MediaPlayerTimeChanged:
+            payload = event.u.new_time
+
+        self._events.put((event.type, player, self._media_epochs.get(id(player), 0), payload))
+
+    def _event_loop(self):
+        while True:
+            item = self._events.get()
+            if item is None:
+                return
+
+            try:
+                self._handle_event(*item)
+            except Exception:
+                pass
+
+    def _handle_event(self, event_type, player, epoch, payload):
+        finished_callback = None
+        finished_trace = None
+        trace_outcome = None
+
+        with self._lock:
+            if epoch != self._media_epochs.get(id(player)):
+                return
+
+            if player is self._standby_player:
+                self._handle_standby_event(event_type)
+                return
+
+            if player is not self.player or self._stop_requested or self._handoff_pending:
+                return
+
+            if event_type == vlc.EventType.MediaPlayerLengthChanged:
+                if payload and payload > 0:
+                    self._last_known_track_duration_ms = int(payload)
+                return
+
+            if self.state == PlayerState.STOPPED:
+                return
+
+            if event_type == vlc.EventType.MediaPlayerPlaying:
+                self._started = True
+                self.state = PlayerState.PLAYING
+
+                trace = self._current_trace()
+                if trace:
+                    trace.lap("until_playing")
+
+                if self._pending_seek_ms > 0:
+                    try:
+                        player.set_time(self._pending_seek_ms)
+                    except Exception:
+                        pass
+                    self._pending_seek_ms = 0
+
+                    if trace:
+                        trace.lap("resume_seek")
+
+                finished_trace, trace_outcome = trace, "playing"
+
+            elif event_type == vlc.EventType.MediaPlayerPaused:
+                self.state = PlayerState.PAUSED
+
+            elif event_type == vlc.EventType.MediaPlayerTimeChanged:
+                self._on_position_changed(payload)
+
+                if self._should_begin_crossfade(payload):
+                    self._begin_crossfade(player)
+                    finished_callback = self._finish_track(True)
+
+            elif event_type == vlc.EventType.MediaPlayerEndReached:
+                if self._looks_truncated():
+                    finished_callback = self._recover_or_finish()
+                else:
+                    finished_callback = self._finish_track(True)
+
+            elif event_type == vlc.EventType.MediaPlayerEncounteredError:
+                if not self._started:
+                    finished_trace, trace_outcome = self._current_trace(), "error"
+
+                finished_callback = self._recover_or_finish()
+
+        if finished_trace and self.tracer:
+            self.tracer.finish(finished_trace, trace_outcome)
+
+        if finished_callback:
+            finished_callback()
+
+    def _current_trace(self):
+        trace = self._trace
+        if trace is None or trace.finished or trace.play_id != self._play_id:
+            return None
+        return trace
+
+    def _begin_trace(self, lock_wait_ms: float, source: str | None = None):
+        if self.tracer is None:
+            return
+
+        self.tracer.finish(self._trace, "superseded")
+
+        trace = self.tracer.begin(self._play_id, self.current_url)
+        trace.add("lock_wait", lock_wait_ms)
+        trace.source = source
+        trace.mark()
+        self._trace = trace
+
+    def _handle_standby_event(self, event_type):
+        if not self._preload_pending_url:
+            return
+
+        if event_type == vlc.EventType.MediaPlayerPaused:
+            self._preloaded_url = self._preload_pending_url
+            self._preload_pending_url = None
+        elif event_type == vlc.EventType.MediaPlayerEncounteredError:
+            self._preloaded_url = None
+            self._preload_pending_url = None
+
+    def _on_position_changed(self, position_ms):
+        if position_ms is None or position_ms <= 0:
+            return
+
+        self._last_position_ms = int(position_ms)
+
+        # Playback has been stable for a while since the last recovery: restore the full retry budget
+        if self._recovery_attempts and self._last_position_ms - self._recovery_position_ms >= self.RECOVERY_RESET_MS:
+            self._recovery_attempts = 0
+
+    def _looks_truncated(self) -> bool:
+        duration_ms = self._last_known_track_duration_ms
+        if duration_ms <= 0:
+            return False
+
+        return self._last_position_ms < duration_ms - self.TRUNCATED_END_TOLERANCE_MS
+
+    def _recover_or_finish(self):
+        if self._recovery_attempts >= self.MAX_RECOVERY_ATTEMPTS:
+            # Out of retries: a failure before playback started is not a natural ending
+            return self._finish_track(self._started)
+
+        self._recovery_attempts += 1
+        delay_s = min(
+            self.RECOVERY_MAX_BACKOFF_S,
+            self.RECOVERY_BACKOFF_S * (2 ** (self._recovery_attempts - 1))
+        )
+
+        position_ms = self._last_position_ms if self._started else self._pending_seek_ms
+        self._recovery_position_ms = position_ms
+        self._started = False
+
+        timer = threading.Timer(
+            delay_s,
+            self._submit_recovery,
+            args=(self._play_id, position_ms)
+        )
+        timer.daemon = True
+        timer.start()
+        return None
+
+    def _submit_recovery(self, play_id: int, position_ms: int):
+        try:
+            self._loader.submit(self._recover_playback, play_id, position_ms)
+        except RuntimeError:
+            pass
+
+    def _recover_playback(self, play_id: int, position_ms: int):
+        with self._lock:
+            if play_id != self._play_id or self._stop_requested:
+                return
+            video_url = self.current_url
+
+            try:
+                media = self.player.get_media()
+                was_local = bool(media) and media.get_mrl().startswith("file:")
+            except Exception:
+                was_local = False
+
+        video_id = extract_video_id(video_url)
+        if video_id:
+            self.stream_cache.invalidate(video_id)
+
+            # A local file that fails to play is corrupt; stream the track instead
+            if was_local and self.audio_cache is not None:
+                self.audio_cache.remove(video_id)
+
+        try:
+            media = self._open_media(video_url)
+        except Exception as e:
+            with self._lock:
+                if play_id != self._play_id or self._stop_requested:
+                    return
+
+                if isinstance(e, UnplayableVideoError):
+                    finished_callback = self._finish_track(True)
+                else:
+                    finished_callback = self._recover_or_finish()
+
+            if finished_callback:
+                finished_callback()
+            return
+
+        with self._lock:
+            # Paused while waiting: play() restarts from the paused position instead
+            if play_id != self._play_id or self._stop_requested or self.state != PlayerState.PLAYING:
+                return
+
+            self._load_media(media, position_ms)
+
+    def _finish_track(self, finished_naturally: bool):
+        self.state = PlayerState.STOPPED
+        self._paused_time_ms = 0
+        self._started = False
+
+        if finished_naturally:
+            return self.on_finished
+        return None
+
     def play(self, video_url: str):
+        lock_wait_start = time.perf_counter()
+
         with self._lock:
-            if self.state == PlayerState.PAUSED and self.current_url == video_url:
+            lock_wait_ms = (time.perf_counter() - lock_wait_start) * 1000
+
+            if self.state == PlayerState.PAUSED and self._same_track(self.current_url, video_url):
                 self._stop_requested = False
 
                 if self.player.get_state() == vlc.State.Paused:
+                    self._begin_trace(lock_wait_ms, "resume")
+                    self._pending_seek_ms = self._paused_time_ms
                     self.player.pause()
                     self.state = PlayerState.PLAYING
-
-                    if self._paused_time_ms > 0:
-                        time.sleep(0.05)
-                        try:
-                            self.player.set_time(self._paused_time_ms)
-                        except Exception:
-                            pass
                     return
 
                 self._play_id += 1
                 local_id = self._play_id
 
                 self._stop_requested = False
+                self._started = False
                 self.current_url = video_url
                 self.state = PlayerState.PLAYING
 
-                threading.Thread(
-                    target=self._play_thread,
-                    args=(local_id, self._paused_time_ms),
-                    daemon=True
-                ).start()
+                self._begin_trace(lock_wait_ms)
+                self._loader.submit(self._start_playback, local_id, self._paused_time_ms)
                 return
 
             if self.state == PlayerState.PLAYING:
@@ -79,103 +414,268 @@ class AudioPlayer:
             local_id = self._play_id
 
             self._stop_requested = False
+            self._started = False
             self.current_url = video_url
             self.state = PlayerState.PLAYING
             self._paused_time_ms = 0
+            self._pending_seek_ms = 0
+            self._last_position_ms = 0
+            self._recovery_attempts = 0
 
             self._last_known_track_duration_ms = 0
 
-            threading.Thread(
-                target=self._play_thread,
-                args=(local_id, 0),
-                daemon=True
-            ).start()
+            preloaded, fade_in = self._take_over_standby(video_url)
+            if preloaded:
+                self._begin_trace(lock_wait_ms, "preloaded")
+                self._resume_preloaded(video_url, fade_in)
+                return
+
+            self._begin_trace(lock_wait_ms)
+            self._loader.submit(self._start_playback, local_id, 0)
 
-    def _play_thread(self, play_id: int, resume_time_ms: int = 0):
-        finished_naturally = False
+    def _take_over_standby(self, video_url: str):
+        preloaded = self._same_track(self._preloaded_url, video_url) and not self._standby_busy
+        fade_in = preloaded and self._handoff_pending
+
+        if not (preloaded or self._handoff_pending):
+            return False, False
+
+        # The outgoing player (stopped, or still fading out after a crossfade) becomes the standby one
+        if self._handoff_pending:
+            self._standby_busy = True
+
+        self.player, self._standby_player = self._standby_player, self.player
+        self._handoff_pending = False
+        self._preloaded_url = None
+        self._preload_pending_url = None
+        self._preload_id += 1
+
+        # Events queued while the new active player was on standby no longer apply
+        self._bump_media_epoch(self.player)
+
+        return preloaded, fade_in
+
+    def _resume_preloaded(self, video_url: str, fade_in: bool):
+        # The preload skipped the disk cache; the track is really playing now, so cache it from its stream URL
+        video_id = extract_video_id(video_url)
+        stream_url = self.stream_cache.get(video_id) if video_id else None
+        if stream_url:
+            self._fill_audio_cache(video_id, stream_url)
 
         try:
-            audio_url = self._get_audio_stream_url(self.current_url)
+            self.player.audio_set_volume(0 if fade_in else self._volume)
+        except Exception:
+            pass
+
+        self.player.set_pause(0)
+
+        if fade_in:
+            self._start_fade_in(self.player)
+
+    def _start_playback(self, play_id: int, resume_time_ms: int = 0):
+        with self._lock:
+            if play_id != self._play_id:
+                return
+            video_url = self.current_url
+
+            trace = self._current_trace()
+            if trace:
+                trace.lap("queue_wait")
+
+        try:
+            media = self._open_media(video_url, trace)
+        except Exception as e:
+            finished_callback = None
+
+            with self._lock:
+                if play_id == self._play_id:
+                    # An unplayable video ends like a finished track, so auto-advance moves past it
+                    finished_callback = self._finish_track(isinstance(e, UnplayableVideoError))
+
+            if self.tracer:
+                self.tracer.finish(trace, "unplayable" if isinstance(e, UnplayableVideoError) else "error")
+
+            if finished_callback:
+                finished_callback()
+            return
+
+        with self._lock:
+            if play_id != self._play_id:
+                return
+
+            self._load_media(media, resume_time_ms)
+
+            if trace:
+                trace.lap("set_media")
+
+    def _load_media(self, media, resume_time_ms: int):
+        self._pending_seek_ms = resume_time_ms
+
+        self.player.set_media(media)
+        self._bump_media_epoch(self.player)
+        self.player.play()
+
+        try:
+            self.player.audio_set_volume(self._volume)
+        except Exception:
+            pass
+
+    def _should_begin_crossfade(self, current_time_ms) -> bool:
+        if self.crossfade_ms <= 0 or not self._preloaded_url or self._standby_busy:
+            return False
+
+        duration_ms = self._last_known_track_duration_ms
+        if duration_ms <= 0 or current_time_ms is None:
+            return False
+
+        return duration_ms - current_time_ms <= self.crossfade_ms
+
+    def _begin_crossfade(self, player):
+        self._handoff_pending = True
 
-            media = self.instance.media_new(audio_url)
-            self.player.set_media(media)
-            self.player.play()
+        threading.Thread(
+            target=self._fade_out_thread,
+            args=(player,),
+            daemon=True
+        ).start()
 
+    def _fade_out_thread(self, player):
+        with self._lock:
+            start_volume = self._volume
+
+        self._ramp_volume(player, start_volume, 0, self.crossfade_ms, lambda: False)
+
+        try:
+            player.stop()
+        except Exception:
+            pass
+
+        with self._lock:
+            if player is self.player:
+                # Nobody took over during the crossfade (e.g. end of the queue)
+                self._handoff_pending = False
+            else:
+                self._standby_busy = False
+
+            deferred_url = self._deferred_preload_url
+            self._deferred_preload_url = None
+
+        if deferred_url:
+            self.preload(deferred_url)
+
+    def _start_fade_in(self, player):
+        with self._lock:
+            self._fade_in_id += 1
+            fade_in_id = self._fade_in_id
+            self._fading_in = True
+            target_volume = self._volume
+
+        def is_cancelled():
+            return fade_in_id != self._fade_in_id
+
+        def run():
+            self._ramp_volume(player, 0, target_volume, self.crossfade_ms, is_cancelled)
+            with self._lock:
+                if fade_in_id == self._fade_in_id:
+                    self._fading_in = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _cancel_fade_in(self):
+        self._fade_in_id += 1
+        if self._fading_in:
+            self._fading_in = False
             try:
                 self.player.audio_set_volume(self._volume)
             except Exception:
                 pass
 
-            timeout = time.time() + 5
-            while time.time() < timeout:
-                state = self.player.get_state()
-                if state in (vlc.State.Playing, vlc.State.Paused):
-                    break
-                time.sleep(0.1)
-
-            state = self.player.get_state()
-            if state not in (vlc.State.Playing, vlc.State.Paused):
-                with self._lock:
-                    if play_id == self._play_id:
-                        self.state = PlayerState.STOPPED
+    def _ramp_volume(self, player, start_volume: int, end_volume: int, duration_ms: int, is_cancelled):
+        steps = max(1, int(duration_ms) // self.FADE_STEP_MS)
+        step_s = max(0.0, duration_ms / steps / 1000)
+
+        for i in range(1, steps + 1):
+            if is_cancelled():
                 return
 
-            if resume_time_ms > 0:
-                try:
-                    time.sleep(0.05)
-                    self.player.set_time(resume_time_ms)
-                except Exception:
-                    pass
+            volume = int(start_volume + (end_volume - start_volume) * i / steps)
+            try:
+                player.audio_set_volume(volume)
+            except Exception:
+                pass
 
-            while True:
-                with self._lock:
-                    if play_id != self._play_id or self._stop_requested:
-                        return
+            time.sleep(step_s)
 
-                state = self.player.get_state()
+    def preload(self, video_url: str):
+        with self._lock:
+            if self._standby_busy or self._handoff_pending:
+                self._deferred_preload_url = video_url
+                return
 
-                if state == vlc.State.Paused:
-                    with self._lock:
-                        if play_id == self._play_id:
-                            self.state = PlayerState.PAUSED
-                    time.sleep(0.2)
-                    continue
+            if self._same_track(self._preloaded_url, video_url):
+                return
 
-                if state == vlc.State.Playing:
-                    with self._lock:
-                        if play_id == self._play_id:
-                            self.state = PlayerState.PLAYING
+            if self._same_track(video_url, self.current_url) and self.state != PlayerState.STOPPED:
+                return
 
-                if state in (vlc.State.Ended, vlc.State.Error):
-                    break
+            self._preload_id += 1
+            preload_id = self._preload_id
+            self._preloaded_url = None
+            self._preload_pending_url = None
+            standby = self._standby_player
 
-                time.sleep(0.3)
+        try:
+            media = self._open_media(video_url, cache_fill=False)
+            media.add_option(":start-paused")
+        except Exception:
+            return
 
-            finished_naturally = not self._stop_requested
+        with self._lock:
+            if preload_id != self._preload_id or standby is not self._standby_player:
+                return
+            if self._standby_busy or self._handoff_pending:
+                self._deferred_preload_url = video_url
+                return
 
-        except Exception:
-            finished_naturally = False
+            try:
+                standby.audio_set_volume(0)
+            except Exception:
+                pass
 
-        finally:
-            with self._lock:
-                if play_id != self._play_id:
-                    return
+            # The Paused event raised by :start-paused marks the preload as ready
+            standby.set_media(media)
+            self._bump_media_epoch(standby)
+            self._preload_pending_url = video_url
+            standby.play()
 
-                self.state = PlayerState.STOPPED
-                self._paused_time_ms = 0
+    def set_quality_profile(self, profile: QualityProfile, fast_start: bool = False):
+        with self._lock:
+            self.format_selector = FormatSelector(
+                profile,
+                fast_start=fast_start,
+                min_abr_kbps=self.format_selector.min_abr_kbps
+            )
+
+        # Cached URLs point at formats chosen under the previous profile
+        self.stream_cache.clear()
 
-            if finished_naturally and self.on_finished:
-                self.on_finished()
+    def set_crossfade_ms(self, crossfade_ms: int):
+        with self._lock:
+            self.crossfade_ms = max(0, int(crossfade_ms))
 
     def pause(self):
         with self._lock:
             if self.state != PlayerState.PLAYING:
                 return
 
+            self._cancel_fade_in()
+
             try:
                 current_time = self.player.get_time()
                 if current_time is not None and current_time > 0:
                     self._paused_time_ms = int(current_time)
+                else:
+                    self._paused_time_ms = self._last_position_ms
             except Exception:
                 self._paused_time_ms = 0
 
@@ -184,35 +684,153 @@ class AudioPlayer:
 
     def stop(self):
         with self._lock:
+            if self.tracer and self._current_trace():
+                self.tracer.finish(self._trace, "cancelled")
+
             self._stop_requested = True
             self._play_id += 1
-            self.player.stop()
+            self._started = False
+            self._pending_seek_ms = 0
+            self._cancel_fade_in()
+
+            # While a crossfade handoff is pending the outgoing player is left to fade out on its own
+            if not self._handoff_pending:
+                self.player.stop()
+                self._bump_media_epoch(self.player)
             self.state = PlayerState.STOPPED
             self._paused_time_ms = 0
             self._last_known_track_duration_ms = 0
 
-    def _get_audio_stream_url(self, video_url: str) -> str:
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "quiet": True,
-            "no_warnings": True,
-            "noplaylist": True,
-            "skip_download": True,
-        }
+    def close(self):
+        self.stop()
+
+        with self._lock:
+            try:
+                self._standby_player.stop()
+            except Exception:
+                pass
+
+        self._events.put(None)
+        self._loader.shutdown(wait=False, cancel_futures=True)
+
+        if self.audio_cache is not None:
+            self.audio_cache.close()
+
+    def _same_track(self, url_a, url_b) -> bool:
+        # URL variants of one video (host, tracking parameters) count as the same track
+        return url_a is not None and url_b is not None and canonical_key(url_a) == canonical_key(url_b)
+
+    def is_known_unplayable(self, video_url: str) -> bool:
+        return self.negative_cache.is_bad(extract_video_id(video_url))
+
+    def resolve_stream_url(self, video_url: str) -> str:
+        return self._get_audio_stream_url(video_url)
+
+    def _open_media(self, video_url: str, trace=None, cache_fill: bool = True):
+        # cache_fill=False (preloads) streams without downloading, so skipped tracks cost no extra bandwidth
+        video_id = extract_video_id(video_url)
+
+        if self.audio_cache is not None and video_id:
+            local_path = self.audio_cache.get_path(video_id)
+            if local_path:
+                media = self.instance.media_new_path(local_path)
+
+                if trace:
+                    trace.source = "disk_cache"
+                    trace.lap("media_new")
+                return media
+
+        audio_url = self._get_audio_stream_url(video_url, trace)
+
+        if trace:
+            trace.lap("extract")
+
+        if cache_fill and video_id:
+            self._fill_audio_cache(video_id, audio_url)
 
-        with YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(video_url, download=False)
+        media = self.instance.media_new(audio_url)
+
+        if trace:
+            trace.lap("media_new")
+        return media
+
+    def _fill_audio_cache(self, video_id: str, stream_url: str):
+        # Writes the track to the disk cache in the background while it streams
+        if self.audio_cache is not None:
+            self.audio_cache.fetch_async(video_id, stream_url)
+
+    def _get_audio_stream_url(self, video_url: str, trace=None) -> str:
+        video_id = extract_video_id(video_url)
+
+        if video_id:
+            cached = self.stream_cache.get(video_id)
+            if cached:
+                if trace:
+                    trace.source = "stream_cache"
+                return cached
+
+        if trace:
+            trace.source = "extracted"
+
+        stream_url = self._extract_audio_stream_url(video_url, trace)
+
+        if video_id:
+            self.stream_cache.put(video_id, stream_url)
+
+        return stream_url
+
+    def _extract_audio_stream_url(self, video_url: str, trace=None) -> str:
+        ydl_opts = self.STREAM_YDL_OPTS
+
+        video_id = extract_video_id(video_url)
+
+        bad = self.negative_cache.get(video_id)
+        if bad is not None:
+            raise UnplayableVideoError(video_id, bad.reason)
+
+        # The info dict is shared between callers; format selection below only reads it
+        flight_key = canonical_key(video_url)
+        try:
+            info = self._single_flight.do(
+                flight_key,
+                self.circuit_breaker.call,
+                self._ydl_pool.extract_info,
+                ydl_opts,
+                video_url,
+                is_failure=is_transient_error
+            )
+        except Exception as e:
+            reason = classify_extraction_error(e)
+            if reason is None:
+                raise
+
+            self.negative_cache.mark_bad(video_id, reason)
+            raise UnplayableVideoError(video_id, reason) from e
+
+        formats = info.get("formats") or []
+        duration_s = info.get("duration")
+
+        with self._lock:
+            selector = self.format_selector
+
+        chosen = selector.select(formats, duration_s)
+        if chosen:
+            format_info = {"video_id": info.get("id"), **selector.describe(chosen, duration_s)}
+            self.last_format = format_info
+
+            if trace:
+                trace.details["format"] = format_info
+
+            return str(chosen["url"]).strip()
 
         direct = info.get("url")
         if isinstance(direct, str) and direct.strip():
             return direct.strip()
 
-        formats = info.get("formats") or []
         if not formats:
             raise RuntimeError("yt_dlp: no formats available")
 
-        audio_formats = [f for f in formats if f.get("acodec") not in (None, "none")]
-        best = audio_formats[-1] if audio_formats else formats[-1]
+        best = formats[-1]
 
         u = best.get("url")
         if not u:
@@ -224,6 +842,8 @@ class AudioPlayer:
         v = max(0, min(100, int(volume)))
         with self._lock:
             self._volume = v
+            self._fade_in_id += 1
+            self._fading_in = False
             try:
                 self.player.audio_set_volume(v)
             except Exception:
@@ -231,6 +851,9 @@ class AudioPlayer:
 
     def get_volume(self) -> int:
         with self._lock:
+            if self._fading_in or self._handoff_pending:
+                return self._volume
+
             try:
                 v = self.player.audio_get_volume()
                 if isinstance(v, int) and 0 <= v <= 100:
@@ -239,6 +862,38 @@ class AudioPlayer:
                 pass
             return self._volume
             
+    def snapshot(self) -> PlaybackSnapshot:
+        with self._lock:
+            state = self.state
+            volume = self._volume
+
+            if state not in (PlayerState.PLAYING, PlayerState.PAUSED):
+                return PlaybackSnapshot(state, 0, 0, 0.0, volume)
+
+            try:
+                current_time = self.player.get_time()
+                current_time_ms = int(current_time) if current_time and current_time > 0 else 0
+            except Exception:
+                current_time_ms = 0
+
+            # LengthChanged keeps the duration up to date; only ask libVLC until it has fired
+            if self._last_known_track_duration_ms <= 0:
+                try:
+                    duration = self.player.get_length()
+                    if duration and duration > 0:
+                        self._last_known_track_duration_ms = int(duration)
+                except Exception:
+                    pass
+
+            track_duration_ms = self._last_known_track_duration_ms
+
+        if track_duration_ms > 0:
+            progress_ratio = max(0.0, min(1.0, current_time_ms / track_duration_ms))
+        else:
+            progress_ratio = 0.0
+
+        return PlaybackSnapshot(state, current_time_ms, track_duration_ms, progress_ratio, volume)
+
     def get_current_playback_time_ms(self) -> int:
         with self._lock:
             try:
@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+
+# Raised instead of calling YouTube while the circuit is open
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after_s: float):
+        super().__init__(f"extraction paused after repeated failures; retry in {retry_after_s:.1f}s")
+        self.retry_after_s = retry_after_s
+
+
+# Global circuit breaker for yt-dlp calls
+# After `failure_threshold` consecutive transient failures (network errors, throttling) the circuit opens and calls fail fast
+# Once the backoff has elapsed a single trial call is let through (half-open): success closes the circuit,
+# failure re-opens it with a doubled backoff
+# Backoffs are jittered so that several clients (or restarts) do not retry in lockstep
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        base_backoff_s: float = 2.0,
+        max_backoff_s: float = 120.0,
+        jitter: float = 0.5
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_backoff_s = base_backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.jitter = jitter
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._open_count = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self):
+        # Raises CircuitOpenError when the call should not be made
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            now = time.monotonic()
+
+            if self._state == self.OPEN and now >= self._open_until:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+
+            self.rejected += 1
+            raise CircuitOpenError(max(0.0, self._open_until - now))
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._open_count = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open()
+
+    def abandon(self):
+        # The call was given up without an outcome (e.g. cancelled); let another trial call through
+        with self._lock:
+            self._trial_in_flight = False
+
+    # is_failure(error) decides whether an exception counts against the circuit (default: every exception)
+    # e.g. a private video is YouTube answering normally, not YouTube failing
+    def call(self, fn, *args, is_failure=None, **kwargs):
+        self.before_call()
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+
+        self.record_success()
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "failures": self._failures,
+                "open_count": self._open_count,
+                "retry_after_s": round(max(0.0, self._open_until - time.monotonic()), 1) if self._state != self.CLOSED else 0.0,
+                "rejected": self.rejected,
+            }
+
+    def _open(self):
+        self._open_count += 1
+        backoff = min(self.max_backoff_s, self.base_backoff_s * (2 ** (self._open_count - 1)))
+
+        # Equal jitter: at least (1 - jitter) of the backoff, at most all of it
+        backoff *= 1 - self.jitter * random.random()
+
+        self._state = self.OPEN
+        self._open_until = time.monotonic() + backoff
+        self._trial_in_flight = False
+
+
+_shared_breaker = None
+_shared_breaker_lock = threading.Lock()
+
+
+def get_shared_circuit_breaker() -> CircuitBreaker:
+    global _shared_breaker
+
+    with _shared_breaker_lock:
+        if _shared_breaker is None:
+            _shared_breaker = CircuitBreaker()
+        return _shared_breaker
@@ -1,9 +1,11 @@
 import csv
 import os
-from typing import List
+import threading
+from typing import Dict, List, Optional, Tuple
+from core.playlist_store import CSV_HEADERS, PlaylistStore, write_playlists_csv
 from models.playlist import Playlist
 
-# Service to manage playlists stored in a CSV file
+# Service to manage playlists stored in a CSV file (PlaylistStore backend)
 # Ensures CSV integrity, loads, adds, and removes playlists
 # Backs up corrupted files
 # CSV file format: id,name,url
@@ -11,11 +13,21 @@ from models.playlist import Playlist
 # Provides methods to load all playlists, add a new playlist, and remove an existing playlist by ID
 # Backs up the original CSV file if headers are incorrect
 # Creates a new CSV file with correct headers if the original is missing or corrupted
-class CSVService:
-    HEADERS = ["id", "name", "url"]
+# Keeps an in-memory id -> Playlist index, parsed once and re-read only when the file's mtime/size change on disk
+# Writes go through to the file and update the index directly; the next ID is a cached counter
+# Removals rewrite the file through a temp file + rename, so a crash mid-write keeps the previous version
+class CSVService(PlaylistStore):
+    HEADERS = CSV_HEADERS
 
     def __init__(self, file_path: str = "playlists.csv"):
         self.file_path = os.path.abspath(file_path)
+
+        # Insertion order follows the file order
+        self._index: Dict[int, Playlist] = {}
+        self._next_id = 1
+        self._file_signature = None
+        self._lock = threading.RLock()
+
         self._ensure_csv_integrity()
 
     def _ensure_csv_integrity(self):
@@ -37,7 +49,17 @@ class CSVService:
             writer.writerow(self.HEADERS)
 
     def load_playlists(self) -> List[Playlist]:
-        playlists = []
+        with self._lock:
+            self._refresh_index()
+            return list(self._index.values())
+
+    def get_playlist(self, playlist_id: int) -> Optional[Playlist]:
+        with self._lock:
+            self._refresh_index()
+            return self._index.get(playlist_id)
+
+    def _read_file(self) -> Dict[int, Playlist]:
+        playlists = {}
 
         with open(self.file_path, "r", newline="", encoding="utf-8") as file:
             reader = csv.DictReader(file)
@@ -49,40 +71,86 @@ class CSVService:
                         name=row["name"],
                         url=row["url"]
                     )
-                    playlists.append(playlist)
+                    playlists[playlist.id] = playlist
                 except (KeyError, ValueError, TypeError):
                     continue
 
         return playlists
 
+    def _current_signature(self):
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh_index(self):
+        # Only re-parses when the file was changed outside this service (or never read yet)
+        signature = self._current_signature()
+        if signature is not None and signature == self._file_signature:
+            return
+
+        if signature is None:
+            self._create_empty_csv()
+
+        self._index = self._read_file()
+        self._next_id = max(self._index, default=0) + 1
+        self._file_signature = self._current_signature()
+
     def _get_next_id(self) -> int:
-        playlists = self.load_playlists()
-        return max((p.id for p in playlists), default=0) + 1
+        self._refresh_index()
+        return self._next_id
 
     def add_playlist(self, name: str, url: str) -> Playlist:
-        new_playlist = Playlist(
-            id=self._get_next_id(),
-            name=name.strip(),
-            url=url.strip()
-        )
+        with self._lock:
+            new_playlist = Playlist(
+                id=self._get_next_id(),
+                name=name.strip(),
+                url=url.strip()
+            )
 
-        with open(self.file_path, "a", newline="", encoding="utf-8") as file:
-            writer = csv.writer(file)
-            writer.writerow([new_playlist.id, new_playlist.name, new_playlist.url])
+            with open(self.file_path, "a", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerow([new_playlist.id, new_playlist.name, new_playlist.url])
+
+            self._index[new_playlist.id] = new_playlist
+            self._next_id = new_playlist.id + 1
+            self._file_signature = self._current_signature()
 
         return new_playlist
 
+    def add_playlists(self, entries: List[Tuple[str, str]]) -> List[Playlist]:
+        if not entries:
+            return []
+
+        with self._lock:
+            next_id = self._get_next_id()
+            new_playlists = [
+                Playlist(id=next_id + i, name=name.strip(), url=url.strip())
+                for i, (name, url) in enumerate(entries)
+            ]
+
+            with open(self.file_path, "a", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerows([p.id, p.name, p.url] for p in new_playlists)
+
+            for p in new_playlists:
+                self._index[p.id] = p
+            self._next_id = new_playlists[-1].id + 1
+            self._file_signature = self._current_signature()
+
+        return new_playlists
+
     def remove_playlist(self, playlist_id: int) -> bool:
-        playlists = self.load_playlists()
-        updated = [p for p in playlists if p.id != playlist_id]
+        with self._lock:
+            self._refresh_index()
 
-        if len(updated) == len(playlists):
-            return False
+            if playlist_id not in self._index:
+                return False
 
-        with open(self.file_path, "w", newline="", encoding="utf-8") as file:
-            writer = csv.writer(file)
-            writer.writerow(self.HEADERS)
-            for p in updated:
-                writer.writerow([p.id, p.name, p.url])
+            del self._index[playlist_id]
+
+            write_playlists_csv(self.file_path, self._index.values())
+            self._file_signature = self._current_signature()
 
-        return True
\ No newline at end of file
+        return True
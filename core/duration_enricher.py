@@ -0,0 +1,53 @@
+from typing import List
+
+from core.job_scheduler import CancelToken, JobScheduler
+from core.track_cache import TrackCache
+from core.yt_service import YouTubeService
+from models.track import Track
+
+# Fills in missing track durations in the background
+# Flat playlist entries usually carry a duration, but some come without one (and older cached playlists never stored it)
+# Looks the missing ones up in small batches as a background-priority job, yielding to foreground loads between batches
+# Each batch is saved to the track cache and reported through on_batch(playlist_key, {Track.key: seconds}) on the UI thread
+# Starting a new enrichment supersedes the previous one
+class DurationEnricher:
+    JOB_KEY = "duration-enrich"
+
+    def __init__(self, yt_service: YouTubeService, track_cache: TrackCache, scheduler: JobScheduler, batch_size: int = 20):
+        self.yt_service = yt_service
+        self.track_cache = track_cache
+        self.scheduler = scheduler
+        self.batch_size = batch_size
+
+        self.on_batch = None
+
+    def start(self, playlist_key: str, tracks: List[Track]):
+        missing = [t for t in tracks if not t.duration]
+        if not missing:
+            self.cancel()
+            return
+
+        self.scheduler.submit(
+            self._enrich_job,
+            playlist_key,
+            missing,
+            key=self.JOB_KEY,
+            priority=JobScheduler.PRIORITY_BACKGROUND
+        )
+
+    def cancel(self):
+        self.scheduler.cancel(self.JOB_KEY)
+
+    def _enrich_job(self, cancel_token: CancelToken, playlist_key: str, tracks: List[Track]):
+        for start in range(0, len(tracks), self.batch_size):
+            self.scheduler.yield_to_foreground(cancel_token)
+
+            batch = tracks[start:start + self.batch_size]
+            durations = self.yt_service.get_durations(batch, cancel_token=cancel_token)
+            if not durations:
+                continue
+
+            self.track_cache.update_durations(durations)
+
+            if self.on_batch:
+                self.scheduler.post(self.on_batch, playlist_key, durations)
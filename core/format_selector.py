@@ -0,0 +1,111 @@
+from enum import Enum
+from typing import List, Optional
+
+class QualityProfile(Enum):
+    DATA_SAVER = "data-saver"
+    BALANCED = "balanced"
+    BEST = "best"
+
+# Chooses the audio format to stream from a yt-dlp "formats" list
+# Ranks audio-only formats by codec (opus > aac > others), average bitrate (abr) and file size
+# Profiles cap the bitrate: data-saver ~64 kbps, balanced ~128 kbps, best uncapped
+# Fast start picks the smallest format that still meets the bitrate floor, so playback can begin sooner
+# Describes the chosen format for diagnostics
+class FormatSelector:
+    PROFILE_MAX_ABR = {
+        QualityProfile.DATA_SAVER: 72,
+        QualityProfile.BALANCED: 140,
+        QualityProfile.BEST: None,
+    }
+
+    CODEC_RANK = {
+        "opus": 3,
+        "aac": 2,
+        "vorbis": 1,
+    }
+
+    def __init__(self, profile: QualityProfile = QualityProfile.BALANCED, fast_start: bool = False, min_abr_kbps: int = 48):
+        self.profile = QualityProfile(profile)
+        self.fast_start = fast_start
+        self.min_abr_kbps = min_abr_kbps
+
+    def select(self, formats: List[dict], duration_s: Optional[float] = None) -> Optional[dict]:
+        candidates = self._audio_candidates(formats)
+        if not candidates:
+            return None
+
+        if self.fast_start:
+            return self._select_fast_start(candidates, duration_s)
+
+        max_abr = self.PROFILE_MAX_ABR[self.profile]
+        if max_abr is not None:
+            within_cap = [f for f in candidates if self._abr(f) <= max_abr]
+            if not within_cap:
+                return min(candidates, key=lambda f: (self._abr(f), -self._codec_rank(f)))
+            candidates = within_cap
+
+        return max(
+            candidates,
+            key=lambda f: (self._abr(f), self._codec_rank(f), -self._size(f, duration_s))
+        )
+
+    def describe(self, fmt: dict, duration_s: Optional[float] = None) -> dict:
+        return {
+            "format_id": fmt.get("format_id"),
+            "ext": fmt.get("ext"),
+            "codec": self._codec(fmt),
+            "abr": round(self._abr(fmt), 1),
+            "filesize": self._size(fmt, duration_s) or None,
+            "profile": self.profile.value,
+            "fast_start": self.fast_start,
+        }
+
+    def _select_fast_start(self, candidates: List[dict], duration_s: Optional[float]) -> dict:
+        above_floor = [f for f in candidates if self._abr(f) >= self.min_abr_kbps]
+        if not above_floor:
+            return max(candidates, key=lambda f: (self._abr(f), self._codec_rank(f)))
+
+        return min(
+            above_floor,
+            key=lambda f: (self._size(f, duration_s) or float("inf"), -self._codec_rank(f), self._abr(f))
+        )
+
+    def _audio_candidates(self, formats: List[dict]) -> List[dict]:
+        playable = [
+            f for f in formats or []
+            if isinstance(f, dict) and f.get("url") and f.get("acodec") not in (None, "none")
+        ]
+
+        audio_only = [f for f in playable if f.get("vcodec") in (None, "none")]
+        return audio_only or playable
+
+    def _codec(self, fmt: dict) -> str:
+        acodec = (fmt.get("acodec") or "").lower()
+
+        if acodec.startswith("opus"):
+            return "opus"
+        if acodec.startswith("mp4a") or acodec.startswith("aac"):
+            return "aac"
+        if acodec.startswith("vorbis"):
+            return "vorbis"
+        return acodec or "unknown"
+
+    def _codec_rank(self, fmt: dict) -> int:
+        return self.CODEC_RANK.get(self._codec(fmt), 0)
+
+    def _abr(self, fmt: dict) -> float:
+        abr = fmt.get("abr") or fmt.get("tbr") or 0
+        try:
+            return float(abr)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _size(self, fmt: dict, duration_s: Optional[float]) -> int:
+        size = fmt.get("filesize") or fmt.get("filesize_approx")
+        if size:
+            return int(size)
+
+        if duration_s and self._abr(fmt) > 0:
+            return int(self._abr(fmt) * 1000 / 8 * duration_s)
+
+        return 0
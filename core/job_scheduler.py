@@ -0,0 +1,208 @@
+import itertools
+import queue
+import threading
+from collections import deque
+
+# Raised inside a job when its cancellation token has been cancelled
+class JobCancelled(Exception):
+    pass
+
+
+# Cooperative cancellation flag handed to every job
+# Long-running work (e.g. playlist extraction) checks it between steps
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class _Job:
+    def __init__(self, fn, args, token, key, on_result, on_error):
+        self.fn = fn
+        self.args = args
+        self.token = token
+        self.key = key
+        self.on_result = on_result
+        self.on_error = on_error
+        self.foreground = False
+
+
+# Central background job scheduler
+# Runs jobs on a bounded pool of worker threads, lower priority values first
+# Jobs submitted with a key supersede (cancel) the previous job with the same key
+# Every job receives a CancelToken as its first argument
+# Results and posted callbacks are queued and delivered on the UI thread by pump(), in batches
+# Background jobs together never take more than max_workers - 1 workers, so a foreground job always finds one free
+# (extra background jobs wait in a deferred list and are re-queued as background jobs finish)
+# Background jobs can yield to foreground work, waiting while any foreground job is running
+class JobScheduler:
+    PRIORITY_FOREGROUND = 0
+    PRIORITY_BACKGROUND = 10
+
+    def __init__(self, max_workers: int = 3):
+        self.max_workers = max_workers
+
+        self._jobs = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._tokens_by_key = {}
+        self._lock = threading.Lock()
+
+        self._foreground_cond = threading.Condition()
+        self._foreground_active = 0
+
+        self._background_limit = max(1, max_workers - 1)
+        self._background_running = 0
+        self._deferred = deque()
+
+        self._callbacks = deque()
+        self._closed = False
+
+        self._workers = []
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, fn, *args, key=None, priority: int = PRIORITY_FOREGROUND, on_result=None, on_error=None) -> CancelToken:
+        token = CancelToken()
+
+        with self._lock:
+            if key is not None:
+                previous = self._tokens_by_key.get(key)
+                if previous is not None:
+                    previous.cancel()
+                self._tokens_by_key[key] = token
+
+        job = _Job(fn, args, token, key, on_result, on_error)
+        job.foreground = priority < self.PRIORITY_BACKGROUND
+
+        self._jobs.put((priority, next(self._sequence), job))
+        return token
+
+    def cancel(self, key):
+        with self._lock:
+            token = self._tokens_by_key.pop(key, None)
+
+        if token is not None:
+            token.cancel()
+
+    def yield_to_foreground(self, cancel_token: CancelToken = None, poll_s: float = 0.25):
+        # Called from background jobs between units of work; raises JobCancelled if cancelled while waiting
+        # Only running foreground jobs count: queued ones always have a worker left to start on
+        with self._foreground_cond:
+            while self._foreground_active and not self._closed and not (cancel_token and cancel_token.cancelled):
+                self._foreground_cond.wait(poll_s)
+
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+    def post(self, callback, *args):
+        # Thread-safe: the callback runs on the UI thread during the next pump()
+        self._callbacks.append((callback, args))
+
+    def pump(self, max_callbacks: int = 100) -> int:
+        delivered = 0
+
+        while delivered < max_callbacks:
+            try:
+                callback, args = self._callbacks.popleft()
+            except IndexError:
+                break
+
+            try:
+                callback(*args)
+            except Exception:
+                pass
+
+            delivered += 1
+
+        return delivered
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            tokens = list(self._tokens_by_key.values())
+            self._tokens_by_key.clear()
+
+        for token in tokens:
+            token.cancel()
+
+        for _ in self._workers:
+            self._jobs.put((float("-inf"), next(self._sequence), None))
+
+    def _worker_loop(self):
+        while True:
+            entry = self._jobs.get()
+            job = entry[2]
+            if job is None:
+                return
+
+            if not self._start(entry):
+                continue
+
+            try:
+                self._run(job)
+            finally:
+                self._forget(job)
+
+    def _start(self, entry) -> bool:
+        # Counts the job as running; returns False if it was deferred instead
+        job = entry[2]
+
+        if job.foreground:
+            with self._foreground_cond:
+                self._foreground_active += 1
+            return True
+
+        with self._lock:
+            if self._background_running >= self._background_limit and not job.token.cancelled:
+                self._deferred.append(entry)
+                return False
+            self._background_running += 1
+        return True
+
+    def _run(self, job):
+        if job.token.cancelled or self._closed:
+            return
+
+        try:
+            result = job.fn(job.token, *job.args)
+        except JobCancelled:
+            return
+        except Exception as e:
+            if job.on_error and not job.token.cancelled:
+                self.post(job.on_error, e)
+            return
+
+        if job.on_result and not job.token.cancelled:
+            self.post(job.on_result, result)
+
+    def _forget(self, job):
+        if job.foreground:
+            with self._foreground_cond:
+                self._foreground_active -= 1
+                self._foreground_cond.notify_all()
+        else:
+            with self._lock:
+                self._background_running -= 1
+                deferred = self._deferred.popleft() if self._deferred else None
+
+            if deferred is not None:
+                self._jobs.put(deferred)
+
+        if job.key is None:
+            return
+
+        with self._lock:
+            if self._tokens_by_key.get(job.key) is job.token:
+                del self._tokens_by_key[job.key]
@@ -0,0 +1,242 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.csv_service import CSVService
+from core.playlist_store import PlaylistStore, fsync_dir
+from models.playlist import Playlist
+
+# Crash-safe playlist storage: an append-only journal of add/remove records (one JSON object per line)
+# PlaylistStore backend, interchangeable with CSVService and SQLitePlaylistStore
+# Every mutation is one appended line, so removals no longer rewrite the whole file
+# Appends reach the OS immediately; fsyncs are batched by a background flusher (at most fsync_interval_s apart)
+# On startup the journal is replayed into an in-memory index; a torn last line from a crash is dropped
+# Once dead records outnumber live playlists the journal is compacted: snapshot to a temp file, fsync, rename
+# A missing journal is seeded from the old playlists CSV; export_csv() writes the CSV format back out
+class JournalPlaylistStore(PlaylistStore):
+    FSYNC_INTERVAL_S = 0.2
+    COMPACT_MIN_RECORDS = 1000
+    COMPACT_RATIO = 2
+
+    def __init__(
+        self,
+        file_path: str = "playlists.journal",
+        seed_csv_path: Optional[str] = None,
+        fsync_interval_s: Optional[float] = None
+    ):
+        self.file_path = os.path.abspath(file_path)
+        self.fsync_interval_s = fsync_interval_s if fsync_interval_s is not None else self.FSYNC_INTERVAL_S
+
+        # Insertion order follows the journal order
+        self._index: Dict[int, Playlist] = {}
+        self._next_id = 1
+        self._records = 0
+        self._lock = threading.RLock()
+
+        self._dirty = False
+        self._closed = False
+        self._wake = threading.Event()
+
+        if not os.path.exists(self.file_path):
+            seed = []
+            if seed_csv_path and os.path.exists(seed_csv_path):
+                seed = CSVService(seed_csv_path).load_playlists()
+            self._write_snapshot(seed)
+
+        self._replay()
+        self._file = open(self.file_path, "a", encoding="utf-8", newline="\n")
+
+        if self._should_compact():
+            self.compact()
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="playlist-journal-fsync", daemon=True)
+        self._flusher.start()
+
+    def load_playlists(self) -> List[Playlist]:
+        with self._lock:
+            return list(self._index.values())
+
+    def get_playlist(self, playlist_id: int) -> Optional[Playlist]:
+        with self._lock:
+            return self._index.get(playlist_id)
+
+    def add_playlist(self, name: str, url: str) -> Playlist:
+        with self._lock:
+            new_playlist = Playlist(
+                id=self._next_id,
+                name=name.strip(),
+                url=url.strip()
+            )
+
+            self._append({"op": "add", **new_playlist.to_dict()})
+            self._index[new_playlist.id] = new_playlist
+            self._next_id = new_playlist.id + 1
+
+        return new_playlist
+
+    def add_playlists(self, entries: List[Tuple[str, str]]) -> List[Playlist]:
+        if not entries:
+            return []
+
+        with self._lock:
+            new_playlists = [
+                Playlist(id=self._next_id + i, name=name.strip(), url=url.strip())
+                for i, (name, url) in enumerate(entries)
+            ]
+
+            self._append_records([{"op": "add", **p.to_dict()} for p in new_playlists])
+            for p in new_playlists:
+                self._index[p.id] = p
+            self._next_id = new_playlists[-1].id + 1
+
+        return new_playlists
+
+    def remove_playlist(self, playlist_id: int) -> bool:
+        with self._lock:
+            if playlist_id not in self._index:
+                return False
+
+            self._append({"op": "remove", "id": playlist_id})
+            del self._index[playlist_id]
+
+            if self._should_compact():
+                self.compact()
+
+        return True
+
+    def compact(self):
+        with self._lock:
+            self._file.close()
+            self._write_snapshot(self._index.values())
+            self._records = len(self._index)
+            self._dirty = False
+            self._file = open(self.file_path, "a", encoding="utf-8", newline="\n")
+
+    def flush(self):
+        # Forces pending appends to disk now instead of waiting for the flusher
+        with self._lock:
+            if self._dirty and not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._dirty = False
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._wake.set()
+        self._flusher.join(timeout=2)
+
+        with self._lock:
+            self.flush()
+            self._file.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "playlists": len(self._index),
+                "records": self._records,
+                "dirty": self._dirty,
+            }
+
+    def _append(self, record: dict):
+        self._append_records([record])
+
+    def _append_records(self, records: List[dict]):
+        if self._closed:
+            raise RuntimeError("playlist journal is closed")
+
+        self._file.write("".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records))
+        self._file.flush()
+        self._records += len(records)
+
+        if self.fsync_interval_s <= 0:
+            os.fsync(self._file.fileno())
+            return
+
+        self._dirty = True
+        self._wake.set()
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+
+            if self._closed:
+                return
+
+            # Lets more appends pile up, then makes all of them durable with one fsync
+            time.sleep(self.fsync_interval_s)
+            try:
+                self.flush()
+            except (OSError, ValueError):
+                pass
+
+    def _should_compact(self) -> bool:
+        return self._records > max(self.COMPACT_MIN_RECORDS, self.COMPACT_RATIO * len(self._index))
+
+    def _replay(self):
+        with open(self.file_path, "rb") as file:
+            data = file.read()
+
+        # Anything after the last newline is a torn write from a crash; everything before it is intact
+        good_size = data.rfind(b"\n") + 1
+        if good_size != len(data):
+            with open(self.file_path, "r+b") as file:
+                file.truncate(good_size)
+
+        lines = [line for line in data[:good_size].decode("utf-8", errors="replace").split("\n") if line.strip()]
+
+        try:
+            # Fast path: one parser call for the whole journal
+            records = json.loads("[" + ",".join(lines) + "]")
+        except ValueError:
+            records = [self._parse_line(line) for line in lines]
+
+        index: Dict[int, Playlist] = {}
+        max_id = 0
+        count = 0
+
+        for record in records:
+            try:
+                op = record["op"]
+                playlist_id = int(record["id"])
+                if op == "add":
+                    playlist = Playlist(id=playlist_id, name=record["name"], url=record["url"])
+            except (KeyError, ValueError, TypeError):
+                continue
+
+            count += 1
+            max_id = max(max_id, playlist_id)
+
+            if op == "add":
+                index[playlist_id] = playlist
+            elif op == "remove":
+                index.pop(playlist_id, None)
+
+        self._index = index
+        self._records = count
+        # Never reuses an ID that appeared in the journal, even if it was removed since
+        self._next_id = max_id + 1
+
+    def _parse_line(self, line: str):
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def _write_snapshot(self, playlists):
+        tmp_path = self.file_path + ".tmp"
+
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as file:
+            for p in playlists:
+                file.write(json.dumps({"op": "add", **p.to_dict()}, ensure_ascii=False, separators=(",", ":")) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(tmp_path, self.file_path)
+        fsync_dir(os.path.dirname(self.file_path))
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+# Raised instead of extracting a video that is known to be unplayable
+class UnplayableVideoError(Exception):
+    def __init__(self, video_id: str, reason: str):
+        super().__init__(f"{video_id} is unplayable ({reason})")
+        self.video_id = video_id
+        self.reason = reason
+
+
+class BadVideo(NamedTuple):
+    reason: str
+    expires_at: float
+
+
+# yt-dlp error messages that mean the video itself cannot be played (retrying will not help)
+# Anything else (network errors, HTTP 429/5xx, timeouts) is treated as transient
+PERMANENT_ERRORS = (
+    ("private video", "private"),
+    ("video unavailable", "unavailable"),
+    ("has been removed", "removed"),
+    ("account associated with this video has been terminated", "removed"),
+    ("not available in your country", "region"),
+    ("blocked it in your country", "region"),
+    ("sign in to confirm your age", "age"),
+    ("members-only", "members_only"),
+    ("join this channel", "members_only"),
+    ("copyright", "copyright"),
+)
+
+
+def classify_extraction_error(error: Exception) -> Optional[str]:
+    if isinstance(error, UnplayableVideoError):
+        return error.reason
+
+    message = str(error).lower()
+    for needle, reason in PERMANENT_ERRORS:
+        if needle in message:
+            return reason
+    return None
+
+
+def is_transient_error(error: Exception) -> bool:
+    return classify_extraction_error(error) is None
+
+
+# Remembers video IDs that failed to extract for a permanent reason (private, removed, region-blocked...)
+# Each entry expires after a TTL that depends on the reason, so restored or unblocked videos are retried eventually
+# Bounded LRU, like the stream URL cache
+class NegativeCache:
+    DEFAULT_TTL_S = 3600
+
+    REASON_TTL_S = {
+        "private": 24 * 3600,
+        "unavailable": 24 * 3600,
+        "removed": 7 * 24 * 3600,
+        "region": 24 * 3600,
+        "age": 24 * 3600,
+        "members_only": 24 * 3600,
+        "copyright": 7 * 24 * 3600,
+    }
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+
+    def get(self, video_id: Optional[str]) -> Optional[BadVideo]:
+        if not video_id:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                return None
+
+            if entry.expires_at <= time.time():
+                del self._entries[video_id]
+                return None
+
+            self._entries.move_to_end(video_id)
+            self.hits += 1
+            return entry
+
+    def is_bad(self, video_id: Optional[str]) -> bool:
+        return self.get(video_id) is not None
+
+    def mark_bad(self, video_id: Optional[str], reason: str, ttl_s: Optional[float] = None):
+        if not video_id:
+            return
+
+        if ttl_s is None:
+            ttl_s = self.REASON_TTL_S.get(reason, self.DEFAULT_TTL_S)
+
+        with self._lock:
+            self._entries[video_id] = BadVideo(reason, time.time() + ttl_s)
+            self._entries.move_to_end(video_id)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, video_id: Optional[str] = None):
+        with self._lock:
+            if video_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(video_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+            }
@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+from utils.validators import extract_video_id
+
+# Timing record of a single play request, from play() until VLC reports Playing
+# Phases are measured as laps between consecutive marks (e.g. lock_wait, extract, media_new, until_playing)
+class PlayTrace:
+    def __init__(self, play_id: int, video_url: str):
+        self.play_id = play_id
+        self.video_id = extract_video_id(video_url)
+        self.source = None
+        self.phases = {}
+        self.details = {}
+        self.started_at = time.time()
+        self.finished = False
+
+        self._start = time.perf_counter()
+        self._mark = self._start
+
+    def add(self, phase: str, duration_ms: float):
+        self.phases[phase] = round(duration_ms, 2)
+
+    def mark(self):
+        self._mark = time.perf_counter()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.add(phase, (now - self._mark) * 1000)
+        self._mark = now
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+
+# Collects time-to-first-audio traces for the play pipeline
+# Writes one JSON record per play to a rotating JSONL file
+# Keeps a bounded window of samples per phase to answer p50/p95/p99 queries in-process
+class PlayTracer:
+    PERCENTILES = (50, 95, 99)
+    TOTAL = "total"
+
+    def __init__(
+        self,
+        log_path: str = "logs/play_trace.jsonl",
+        max_bytes: int = 1024 * 1024,
+        backup_count: int = 3,
+        window_size: int = 500
+    ):
+        self.log_path = os.path.abspath(log_path)
+        self.window_size = window_size
+
+        self._samples = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+
+        self._logger = logging.getLogger(f"mirinoi.play_trace.{id(self)}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+
+        self._handler = RotatingFileHandler(
+            self.log_path,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8"
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        self._logger.addHandler(self._handler)
+
+    def begin(self, play_id: int, video_url: str) -> PlayTrace:
+        return PlayTrace(play_id, video_url)
+
+    def finish(self, trace: Optional[PlayTrace], outcome: str):
+        if trace is None or trace.finished:
+            return
+
+        trace.finished = True
+        total_ms = round(trace.elapsed_ms(), 2)
+
+        record = {
+            "ts": round(trace.started_at, 3),
+            "video_id": trace.video_id,
+            "source": trace.source,
+            "outcome": outcome,
+            "phases_ms": trace.phases,
+            "total_ms": total_ms,
+        }
+
+        if trace.details:
+            record["details"] = trace.details
+
+        try:
+            self._logger.info(json.dumps(record, ensure_ascii=False))
+        except Exception:
+            pass
+
+        if outcome != "playing":
+            return
+
+        with self._lock:
+            self._add_sample(self.TOTAL, total_ms)
+            for phase, duration_ms in trace.phases.items():
+                self._add_sample(phase, duration_ms)
+
+    def percentiles(self, phase: str = TOTAL) -> dict:
+        with self._lock:
+            samples = sorted(self._samples.get(phase, ()))
+
+        result = {"count": len(samples)}
+        for p in self.PERCENTILES:
+            result[f"p{p}"] = self._percentile(samples, p)
+        return result
+
+    def summary(self) -> dict:
+        with self._lock:
+            phases = list(self._samples.keys())
+
+        return {phase: self.percentiles(phase) for phase in phases}
+
+    def dump(self, path: Optional[str] = None) -> dict:
+        summary = self.summary()
+        target = path or os.path.join(os.path.dirname(self.log_path), "play_trace_summary.json")
+
+        try:
+            with open(target, "w", encoding="utf-8") as file:
+                json.dump(summary, file, indent=2)
+        except OSError:
+            pass
+
+        return summary
+
+    def close(self):
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
+
+    def _add_sample(self, phase: str, duration_ms: float):
+        samples = self._samples.get(phase)
+        if samples is None:
+            samples = deque(maxlen=self.window_size)
+            self._samples[phase] = samples
+        samples.append(duration_ms)
+
+    def _percentile(self, sorted_samples, percentile: int) -> Optional[float]:
+        if not sorted_samples:
+            return None
+
+        rank = (len(sorted_samples) - 1) * percentile / 100
+        low = int(rank)
+        high = min(low + 1, len(sorted_samples) - 1)
+        fraction = rank - low
+        return round(sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * fraction, 2)
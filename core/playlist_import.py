@@ -0,0 +1,155 @@
+import csv
+import os
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from core.playlist_store import PlaylistStore
+from models.playlist import Playlist
+from utils.validators import KIND_PLAYLIST, canonical_key, is_non_empty_string, is_valid_url
+
+URL_PATTERN = re.compile(r"\S*(?:youtube\.com|youtu\.be)/\S+", re.IGNORECASE)
+
+
+class ImportReport(NamedTuple):
+    added: List[Playlist]
+    duplicates: int
+    invalid: int
+
+
+# Bulk playlist import/export for any PlaylistStore
+# Reads CSV (name,url or id,name,url), M3U/M3U8 (#EXTINF titles) or plain text (one URL per line, optional name)
+# Entries are validated with utils.validators; only URLs with a playlist ID are accepted
+# Duplicates (same canonical playlist ID, in the file or already saved) are skipped
+# Everything left is added through PlaylistStore.add_playlists: IDs assigned in one pass, a single write
+# Export writes the same formats back, chosen by file extension
+def parse_playlist_file(path: str) -> List[Tuple[Optional[str], str]]:
+    ext = os.path.splitext(path)[1].lower()
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as file:
+        if ext == ".csv":
+            return _parse_csv(file)
+        if ext in (".m3u", ".m3u8"):
+            return _parse_m3u(file)
+        return _parse_text(file)
+
+
+def import_playlists(store: PlaylistStore, path: str) -> ImportReport:
+    seen = {canonical_key(p.url, KIND_PLAYLIST) for p in store.load_playlists()}
+    entries = []
+    duplicates = 0
+    invalid = 0
+
+    for name, url in parse_playlist_file(path):
+        url = url.strip()
+        key = canonical_key(url, KIND_PLAYLIST)
+        kind, playlist_id = key
+
+        if not is_valid_url(url) or kind != KIND_PLAYLIST:
+            invalid += 1
+            continue
+
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+
+        entries.append((name.strip() if is_non_empty_string(name) else f"Playlist {playlist_id}", url))
+
+    return ImportReport(store.add_playlists(entries), duplicates, invalid)
+
+
+def export_playlists(store: PlaylistStore, path: str):
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".csv":
+        store.export_csv(path)
+        return
+
+    playlists = store.load_playlists()
+
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        if ext in (".m3u", ".m3u8"):
+            file.write("#EXTM3U\n")
+            for p in playlists:
+                file.write(f"#EXTINF:-1,{p.name}\n{p.url}\n")
+        else:
+            for p in playlists:
+                file.write(f"{p.name}\t{p.url}\n")
+
+
+def _parse_csv(file) -> List[Tuple[Optional[str], str]]:
+    rows = list(csv.reader(file))
+    if not rows:
+        return []
+
+    header = [h.strip().lower() for h in rows[0]]
+    if "url" in header:
+        url_col = header.index("url")
+        name_col = header.index("name") if "name" in header else None
+        rows = rows[1:]
+    else:
+        # No header: the URL is whichever column holds one, the name the first other non-empty column
+        url_col = name_col = None
+
+    entries = []
+    for row in rows:
+        if url_col is not None:
+            if url_col >= len(row):
+                continue
+            name = row[name_col] if name_col is not None and name_col < len(row) else None
+            entries.append((name, row[url_col]))
+            continue
+
+        url = next((c for c in row if URL_PATTERN.search(c)), None)
+        if url is None:
+            if any(c.strip() for c in row):
+                entries.append((None, ""))
+            continue
+
+        name = next((c for c in row if c is not url and c.strip() and not c.strip().isdigit()), None)
+        entries.append((name, url))
+
+    return entries
+
+
+def _parse_m3u(file) -> List[Tuple[Optional[str], str]]:
+    entries = []
+    title = None
+
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith("#EXTINF"):
+            # #EXTINF:<duration>[ attributes],<title>
+            title = line.split(",", 1)[1] if "," in line else None
+            continue
+
+        if line.startswith("#"):
+            continue
+
+        entries.append((title, line))
+        title = None
+
+    return entries
+
+
+def _parse_text(file) -> List[Tuple[Optional[str], str]]:
+    entries = []
+
+    for line in file:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        match = URL_PATTERN.search(line)
+        if match is None:
+            entries.append((None, line))
+            continue
+
+        # Whatever surrounds the URL ("Name - URL", "Name<TAB>URL", ...) is the name
+        name = (line[:match.start()] + line[match.end():]).strip(" \t-|;,:")
+        entries.append((name or None, match.group(0)))
+
+    return entries
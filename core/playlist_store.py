@@ -0,0 +1,75 @@
+import csv
+import os
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Tuple
+
+from models.playlist import Playlist
+from utils.validators import KIND_PLAYLIST, canonical_key
+
+CSV_HEADERS = ["id", "name", "url"]
+
+
+# Storage interface shared by every playlist backend (CSV file, append-only journal, SQLite)
+# The UI only uses these methods, so backends can be swapped without touching MainWindow or PlaylistSidebar
+# Playlists keep a unique integer ID; load_playlists returns them in insertion order
+# find_by_url and export_csv have generic implementations; backends override them when they can do better
+class PlaylistStore(ABC):
+    @abstractmethod
+    def load_playlists(self) -> List[Playlist]:
+        ...
+
+    @abstractmethod
+    def get_playlist(self, playlist_id: int) -> Optional[Playlist]:
+        ...
+
+    @abstractmethod
+    def add_playlist(self, name: str, url: str) -> Playlist:
+        ...
+
+    @abstractmethod
+    def remove_playlist(self, playlist_id: int) -> bool:
+        ...
+
+    # Adds (name, url) pairs in order; backends override it to assign the IDs and write everything in one pass
+    def add_playlists(self, entries: List[Tuple[str, str]]) -> List[Playlist]:
+        return [self.add_playlist(name, url) for name, url in entries]
+
+    def find_by_url(self, url: str) -> Optional[Playlist]:
+        key = canonical_key(url, KIND_PLAYLIST)
+        return next((p for p in self.load_playlists() if canonical_key(p.url, KIND_PLAYLIST) == key), None)
+
+    def export_csv(self, csv_path: str):
+        write_playlists_csv(os.path.abspath(csv_path), self.load_playlists())
+
+    def close(self):
+        pass
+
+
+# Writes a complete playlists CSV atomically: temp file in the same folder, fsync, then rename over the target
+def write_playlists_csv(file_path: str, playlists: Iterable[Playlist]):
+    tmp_path = file_path + ".tmp"
+
+    with open(tmp_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_HEADERS)
+        writer.writerows([p.id, p.name, p.url] for p in playlists)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(tmp_path, file_path)
+    fsync_dir(os.path.dirname(file_path))
+
+
+def fsync_dir(dir_path: str):
+    # Makes a rename durable; not supported on Windows, where os.replace is already durable enough
+    try:
+        fd = os.open(dir_path or ".", os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
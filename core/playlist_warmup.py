@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+from core.job_scheduler import CancelToken, JobScheduler
+from core.track_cache import TrackCache
+from core.yt_service import YouTubeService
+from models.playlist import Playlist
+
+# Opt-in background warm-up of saved playlists into the track cache
+# Extracts every playlist (or only the N most recently opened) so clicking one later renders instantly
+# Runs as background-priority jobs on the shared scheduler, limited to a few concurrent extractions
+# Leaves one playlist extraction slot free, so a clicked playlist never waits for a warm-up to finish paging
+# Yields to foreground work (e.g. the playlist the user just clicked) before starting each playlist
+# Skips playlists fetched recently and reports progress as (done, total)
+class PlaylistWarmup:
+    JOB_KEY = "playlist-warmup"
+
+    def __init__(
+        self,
+        yt_service: YouTubeService,
+        track_cache: TrackCache,
+        scheduler: JobScheduler,
+        key_fn: Callable[[str], str],
+        concurrency: int = 2,
+        max_age_s: float = 6 * 3600
+    ):
+        self.yt_service = yt_service
+        self.track_cache = track_cache
+        self.scheduler = scheduler
+        self.key_fn = key_fn
+        self.max_age_s = max_age_s
+
+        # More warm-up jobs than background slots would only sit in the scheduler's deferred list
+        # An extraction keeps its YoutubeDL instance (or worker process) until the whole playlist is paged,
+        # so the warm-up must also leave one playlist slot for foreground loads
+        self.concurrency = max(1, min(concurrency, scheduler.max_workers - 1, yt_service.playlist_slots - 1))
+
+        self.on_progress = None
+
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._total = 0
+        self._done = 0
+        self._tokens = []
+
+    def start(self, playlists: List[Playlist], limit: Optional[int] = None):
+        self.cancel()
+
+        selected = self._select(playlists, limit)
+
+        with self._lock:
+            self._pending = deque(selected)
+            self._total = len(selected)
+            self._done = 0
+
+        self._report()
+
+        if not selected:
+            return
+
+        for i in range(min(self.concurrency, len(selected))):
+            token = self.scheduler.submit(
+                self._warm_job,
+                key=f"{self.JOB_KEY}-{i}",
+                priority=JobScheduler.PRIORITY_BACKGROUND
+            )
+            self._tokens.append(token)
+
+    def cancel(self):
+        for token in self._tokens:
+            token.cancel()
+        self._tokens = []
+
+        with self._lock:
+            self._pending.clear()
+
+    def _select(self, playlists: List[Playlist], limit: Optional[int]) -> List[Tuple[Playlist, str]]:
+        times = self.track_cache.get_playlist_times()
+        now = time.time()
+
+        candidates = []
+        seen = set()
+
+        for playlist in playlists:
+            key = self.key_fn(playlist.url)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            fetched_at, last_opened_at = times.get(key, (None, None))
+            candidates.append((playlist, key, fetched_at, last_opened_at or 0))
+
+        if limit is not None:
+            candidates.sort(key=lambda c: c[3], reverse=True)
+            candidates = candidates[:limit]
+
+        return [
+            (playlist, key)
+            for playlist, key, fetched_at, _ in candidates
+            if fetched_at is None or now - fetched_at > self.max_age_s
+        ]
+
+    def _warm_job(self, cancel_token: CancelToken):
+        while True:
+            self.scheduler.yield_to_foreground(cancel_token)
+
+            with self._lock:
+                if not self._pending:
+                    return
+                playlist, key = self._pending.popleft()
+
+            tracks = self.yt_service.get_tracks_from_playlist(playlist.url, cancel_token=cancel_token)
+            cancel_token.raise_if_cancelled()
+
+            # An empty result usually means the extraction failed; keep whatever is cached
+            if tracks:
+                self.track_cache.save_tracks(key, tracks)
+
+            with self._lock:
+                self._done += 1
+
+            self._report()
+
+    def _report(self):
+        if self.on_progress is None:
+            return
+
+        with self._lock:
+            done, total = self._done, self._total
+
+        self.scheduler.post(self.on_progress, done, total)
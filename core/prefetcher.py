@@ -0,0 +1,75 @@
+import threading
+
+# Background resolver of stream URLs for upcoming tracks
+# Runs a single long-lived worker thread fed by schedule()
+# Each schedule() call replaces any pending work, so stale targets are dropped when the queue changes
+# Waits a short debounce delay before resolving so quick skips do not trigger wasted extractions
+# The first upcoming track can be handed to a separate preload callback (e.g. to buffer it on a standby player)
+# Resolution errors are ignored; the track will simply be resolved again when it is played
+class StreamPrefetcher:
+    def __init__(self, resolve_callback, depth: int = 2, debounce_s: float = 1.0, preload_callback=None):
+        self.resolve_callback = resolve_callback
+        self.preload_callback = preload_callback
+        self.depth = depth
+        self.debounce_s = debounce_s
+
+        self._pending = []
+        self._preload_target = None
+        self._generation = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def schedule(self, video_urls):
+        with self._cond:
+            self._generation += 1
+            self._pending = list(video_urls)[:self.depth]
+            self._preload_target = self._pending[0] if self._pending else None
+            self._cond.notify()
+
+    def cancel(self):
+        self.schedule([])
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            self._pending = []
+            self._cond.notify()
+
+    def _run(self):
+        settled_generation = -1
+
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+
+                if self._closed:
+                    return
+
+                generation = self._generation
+                if generation != settled_generation:
+                    self._cond.wait(self.debounce_s)
+
+                    if self._closed:
+                        return
+                    if generation != self._generation:
+                        continue
+
+                    settled_generation = generation
+
+                if not self._pending:
+                    continue
+
+                video_url = self._pending.pop(0)
+
+                callback = self.resolve_callback
+                if self.preload_callback and video_url == self._preload_target:
+                    callback = self.preload_callback
+
+            try:
+                callback(video_url)
+            except Exception:
+                pass
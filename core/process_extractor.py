@@ -0,0 +1,179 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core.ydl_pool import YdlPool, get_shared_pool
+
+# Optional process-pool backend for yt-dlp extraction
+# yt-dlp is CPU-heavy pure Python (JSON parsing, signature/JS handling); on threads it competes with Tk for the GIL
+# Runs extractions in worker processes instead, each keeping its own YoutubeDL instances per option set
+# Workers are started and warmed up (yt-dlp imported, extractors loaded) when the backend is created
+# Always uses the spawn start method: forking after Tk and the scheduler threads start would copy their state and held locks
+# Results are trimmed to the fields the app uses and sent back as plain dicts/lists
+# Same interface as YdlPool (extract_info / iter_entries); falls back to the thread pool if the process pool breaks
+class ProcessExtractor:
+    # Fields kept from info dicts, entries and formats; everything else stays in the worker
+    INFO_KEYS = ("_type", "id", "title", "artist", "uploader", "channel", "duration", "thumbnail", "thumbnails", "url")
+    FORMAT_KEYS = ("format_id", "ext", "acodec", "vcodec", "abr", "tbr", "filesize", "filesize_approx", "url")
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        warm_opts=None,
+        factory=None,
+        fallback: YdlPool | None = None
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self._fallback = fallback
+        self._broken = False
+        self._lock = threading.Lock()
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(factory, list(warm_opts or [])),
+        )
+
+        self.calls = 0
+        self.fallback_calls = 0
+
+        self._warm_up()
+
+    @property
+    def playlist_slots(self) -> int:
+        # Each playlist extraction occupies a whole worker until its entry list is materialized
+        return self.max_workers
+
+    def extract_info(self, opts: dict, url: str, download: bool = False, process: bool = True) -> dict:
+        if download:
+            raise ValueError("ProcessExtractor does not download")
+
+        result = self._run(_worker_extract, opts, url, process)
+        if result is _FALLBACK:
+            return self._fallback_pool().extract_info(opts, url, process=process)
+        return result
+
+    def iter_entries(self, opts: dict, url: str):
+        # The worker materializes the whole entry list; only the parsing into Tracks stays incremental
+        result = self._run(_worker_entries, opts, url)
+        if result is _FALLBACK:
+            yield from self._fallback_pool().iter_entries(opts, url)
+            return
+
+        yield from result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "calls": self.calls,
+                "fallback_calls": self.fallback_calls,
+                "broken": self._broken,
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _warm_up(self):
+        # ProcessPoolExecutor starts workers lazily; one no-op per worker spawns them all now
+        for _ in range(self.max_workers):
+            try:
+                self._executor.submit(os.getpid)
+            except Exception:
+                self._mark_broken()
+                return
+
+    def _run(self, fn, *args):
+        with self._lock:
+            broken = self._broken
+            if broken:
+                self.fallback_calls += 1
+            else:
+                self.calls += 1
+
+        if broken:
+            return _FALLBACK
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError):
+            self._mark_broken()
+            return _FALLBACK
+
+        # Extraction errors raised in the worker propagate as usual; only a dead pool triggers the fallback
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._mark_broken()
+            return _FALLBACK
+
+    def _mark_broken(self):
+        with self._lock:
+            self._broken = True
+
+    def _fallback_pool(self) -> YdlPool:
+        if self._fallback is None:
+            self._fallback = get_shared_pool()
+        return self._fallback
+
+
+_FALLBACK = object()
+
+
+# Worker process side: one YdlPool per worker, created by the pool initializer
+
+_worker_pool = None
+
+
+def _init_worker(factory, warm_opts):
+    global _worker_pool
+
+    if factory is None:
+        from yt_dlp import YoutubeDL
+        factory = YoutubeDL
+
+    _worker_pool = YdlPool(max_instances=4, max_per_key=1, factory=factory)
+
+    for opts in warm_opts:
+        try:
+            with _worker_pool.checkout(opts):
+                pass
+        except Exception:
+            pass
+
+
+def _worker_extract(opts: dict, url: str, process: bool) -> dict:
+    info = _worker_pool.extract_info(opts, url, process=process)
+    return _trim_info(info)
+
+
+def _worker_entries(opts: dict, url: str) -> list:
+    return [_trim_info(e) for e in _worker_pool.iter_entries(opts, url) if isinstance(e, dict)]
+
+
+def _trim_info(info):
+    if not isinstance(info, dict):
+        return info
+
+    trimmed = {k: info[k] for k in ProcessExtractor.INFO_KEYS if k in info}
+
+    formats = info.get("formats")
+    if isinstance(formats, list):
+        trimmed["formats"] = [
+            {k: f[k] for k in ProcessExtractor.FORMAT_KEYS if k in f}
+            for f in formats
+            if isinstance(f, dict)
+        ]
+
+    entries = info.get("entries")
+    if entries is not None:
+        trimmed["entries"] = [_trim_info(e) for e in entries if isinstance(e, dict)]
+
+    thumbnails = trimmed.get("thumbnails")
+    if isinstance(thumbnails, list):
+        trimmed["thumbnails"] = [{"url": t.get("url")} for t in thumbnails if isinstance(t, dict) and t.get("url")]
+
+    return trimmed
@@ -1,4 +1,5 @@
 import random
+from models.track import occurrence_keys
 
 # Manages the playback queue of tracks
 # Supports setting the queue, navigating tracks, shuffling, and unshuffling
@@ -9,16 +10,67 @@ import random
 # Keeps track of the current index in the queue
 # Allows wrapping around the queue when navigating next/previous
 # Preserves the original queue order for unshuffling
+# Notifies an optional on_changed callback whenever the order or the current position changes
 class QueueManager:
     def __init__(self):
         self.queue = []
         self.original_queue = []  
         self.current_index = 0
 
+        self.on_changed = None
+
+    def _notify_changed(self):
+        if self.on_changed:
+            self.on_changed()
+
     def set_queue(self, tracks):
         self.queue = tracks.copy()
         self.original_queue = tracks.copy()  
         self.current_index = 0
+        self._notify_changed()
+
+    def extend(self, tracks):
+        if not tracks:
+            return
+
+        self.queue.extend(tracks)
+        self.original_queue.extend(tracks)
+        self._notify_changed()
+
+    def apply_update(self, tracks, shuffled: bool = False):
+        # Occurrence keys tell repeated copies of the same video apart
+        old_keys = occurrence_keys(self.queue)
+        current_key = old_keys[self.current_index] if 0 <= self.current_index < len(old_keys) else None
+
+        new_keys = occurrence_keys(tracks)
+        new_by_key = dict(zip(new_keys, tracks))
+        self.original_queue = tracks.copy()
+
+        if shuffled:
+            # Keep the shuffled order for tracks that are still there and shuffle the new ones in at the end
+            known_keys = set(old_keys)
+            kept = [new_by_key[k] for k in old_keys if k in new_by_key]
+            added = [t for t, k in zip(tracks, new_keys) if k not in known_keys]
+            random.shuffle(added)
+            self.queue = kept + added
+        else:
+            self.queue = tracks.copy()
+
+        self.current_index = 0
+        if current_key is not None:
+            for i, k in enumerate(occurrence_keys(self.queue)):
+                if k == current_key:
+                    self.current_index = i
+                    break
+
+        self._notify_changed()
+
+    def set_current_index(self, index: int):
+        if not self.queue:
+            return
+
+        self.current_index = max(0, min(int(index), len(self.queue) - 1))
+        self._notify_changed()
 
     def current(self):
         if not self.queue:
@@ -33,6 +85,7 @@ class QueueManager:
             return None
 
         self.current_index += 1
+        self._notify_changed()
         return self.current()
 
 
@@ -44,6 +97,7 @@ class QueueManager:
             return None
 
         self.current_index -= 1
+        self._notify_changed()
         return self.current()
 
 
@@ -59,6 +113,8 @@ class QueueManager:
         else:
             self.current_index = 0
 
+        self._notify_changed()
+
     def unshuffle(self):
         if not self.original_queue:
             return
@@ -71,7 +127,31 @@ class QueueManager:
         else:
             self.current_index = 0
 
+        self._notify_changed()
+
+    def upcoming(self, count: int, wrap: bool = False):
+        if not self.queue or count <= 0:
+            return []
+
+        tracks = []
+        index = self.current_index
+
+        while len(tracks) < count:
+            index += 1
+            if index >= len(self.queue):
+                if not wrap:
+                    break
+                index = 0
+
+            if index == self.current_index:
+                break
+
+            tracks.append(self.queue[index])
+
+        return tracks
+
     def clear(self):
         self.queue.clear()
         self.original_queue.clear()
         self.current_index = 0
+        self._notify_changed()
@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import Future
+
+# Collapses concurrent calls for the same key into one in-flight call
+# The first caller (the leader) runs the function; callers arriving while it runs wait and share its result or exception
+# Nothing is cached: once the call completes, the next caller for that key starts a new one
+# Counts how many calls were started and how many duplicates were saved
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        self.started = 0
+        self.saved = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.started += 1
+            else:
+                self.saved += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._complete(key)
+            future.set_exception(e)
+            raise
+
+        self._complete(key)
+        future.set_result(result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "started": self.started,
+                "saved": self.saved,
+            }
+
+    def _complete(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+
+_shared_single_flight = None
+_shared_single_flight_lock = threading.Lock()
+
+
+def get_shared_single_flight() -> SingleFlight:
+    global _shared_single_flight
+
+    with _shared_single_flight_lock:
+        if _shared_single_flight is None:
+            _shared_single_flight = SingleFlight()
+        return _shared_single_flight
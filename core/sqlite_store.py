@@ -0,0 +1,167 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from core.csv_service import CSVService
+from core.playlist_store import PlaylistStore
+from models.playlist import Playlist
+from utils.validators import KIND_PLAYLIST, canonical_url
+
+# SQLite playlist storage (PlaylistStore backend)
+# WAL mode, so other tools can read the library while the player writes to it
+# Indexed by ID (primary key) and by canonical playlist URL; IDs are never reused (AUTOINCREMENT)
+# A single connection is shared across threads and serialized with a lock, like TrackCache
+# load_playlists is served from an in-memory copy, re-read only when another connection commits (PRAGMA data_version)
+class SQLitePlaylistStore(PlaylistStore):
+    def __init__(self, db_path: str = "playlists.db"):
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._create_schema()
+
+        self._cache: Optional[Dict[int, Playlist]] = None
+        self._data_version = None
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS playlists (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    canonical_url TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_playlists_canonical_url ON playlists (canonical_url)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    def load_playlists(self) -> List[Playlist]:
+        with self._lock:
+            # data_version only changes for commits made by other connections; our own writes update the cache
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+            if self._cache is None or data_version != self._data_version:
+                rows = self._conn.execute("SELECT id, name, url FROM playlists ORDER BY id").fetchall()
+                self._cache = {row[0]: Playlist(id=row[0], name=row[1], url=row[2]) for row in rows}
+                self._data_version = data_version
+
+            return list(self._cache.values())
+
+    def get_playlist(self, playlist_id: int) -> Optional[Playlist]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, name, url FROM playlists WHERE id = ?", (playlist_id,)
+            ).fetchone()
+
+        return Playlist(id=row[0], name=row[1], url=row[2]) if row else None
+
+    def find_by_url(self, url: str) -> Optional[Playlist]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, name, url FROM playlists WHERE canonical_url = ? ORDER BY id LIMIT 1",
+                (canonical_url(url, KIND_PLAYLIST),)
+            ).fetchone()
+
+        return Playlist(id=row[0], name=row[1], url=row[2]) if row else None
+
+    def add_playlist(self, name: str, url: str) -> Playlist:
+        name = name.strip()
+        url = url.strip()
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO playlists (name, url, canonical_url) VALUES (?, ?, ?)",
+                (name, url, canonical_url(url, KIND_PLAYLIST))
+            )
+
+            playlist = Playlist(id=cursor.lastrowid, name=name, url=url)
+            if self._cache is not None:
+                self._cache[playlist.id] = playlist
+
+        return playlist
+
+    def add_playlists(self, entries: List[Tuple[str, str]]) -> List[Playlist]:
+        new_playlists = []
+
+        # One transaction, so the whole batch costs a single commit
+        with self._lock, self._conn:
+            for name, url in entries:
+                name = name.strip()
+                url = url.strip()
+                cursor = self._conn.execute(
+                    "INSERT INTO playlists (name, url, canonical_url) VALUES (?, ?, ?)",
+                    (name, url, canonical_url(url, KIND_PLAYLIST))
+                )
+                new_playlists.append(Playlist(id=cursor.lastrowid, name=name, url=url))
+
+            if self._cache is not None:
+                for p in new_playlists:
+                    self._cache[p.id] = p
+
+        return new_playlists
+
+    def remove_playlist(self, playlist_id: int) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM playlists WHERE id = ?", (playlist_id,))
+
+            if self._cache is not None:
+                self._cache.pop(playlist_id, None)
+
+        return cursor.rowcount > 0
+
+    def import_playlists(self, playlists: List[Playlist]) -> int:
+        # Keeps the given IDs, so anything keyed by playlist ID stays valid after a migration
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO playlists (id, name, url, canonical_url) VALUES (?, ?, ?, ?)",
+                [(p.id, p.name, p.url, canonical_url(p.url, KIND_PLAYLIST)) for p in playlists]
+            )
+            self._cache = None
+
+        return cursor.rowcount
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# One-shot import of playlists.csv into a SQLite store
+# Runs only once per database (recorded in the meta table); the CSV file is left in place as a backup
+# Returns the number of imported playlists (0 if it already ran or there was nothing to import)
+def migrate_csv_to_sqlite(csv_path: str, store: SQLitePlaylistStore) -> int:
+    csv_path = os.path.abspath(csv_path)
+
+    if store.get_meta("csv_migrated") is not None:
+        return 0
+
+    imported = 0
+    if os.path.exists(csv_path):
+        imported = store.import_playlists(CSVService(csv_path).load_playlists())
+
+    store.set_meta("csv_migrated", csv_path)
+    return imported
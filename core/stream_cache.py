@@ -0,0 +1,91 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+# Thread-safe cache of resolved audio stream URLs
+# Keyed by YouTube video ID
+# Each entry expires at the "expire=" timestamp embedded in the googlevideo URL, minus a safety margin
+# Falls back to a default TTL when the URL carries no expiry information
+# Bounded in size, evicting the least recently used entry first
+# Keeps hit/miss counters for diagnostics
+class StreamUrlCache:
+    _PATH_EXPIRE_PATTERN = re.compile(r"/expire/(\d+)")
+
+    def __init__(self, max_entries: int = 200, safety_margin_s: int = 300, default_ttl_s: int = 3600):
+        self.max_entries = max_entries
+        self.safety_margin_s = safety_margin_s
+        self.default_ttl_s = default_ttl_s
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, video_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stream_url, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[video_id]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(video_id)
+            self.hits += 1
+            return stream_url
+
+    def put(self, video_id: str, stream_url: str):
+        expires_at = self._compute_expiry(stream_url)
+        if expires_at <= time.time():
+            return
+
+        with self._lock:
+            self._entries[video_id] = (stream_url, expires_at)
+            self._entries.move_to_end(video_id)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, video_id: str):
+        with self._lock:
+            self._entries.pop(video_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _compute_expiry(self, stream_url: str) -> float:
+        expire_ts = None
+
+        try:
+            parsed = urlparse(stream_url)
+            values = parse_qs(parsed.query).get("expire")
+            if values:
+                expire_ts = int(values[0])
+            else:
+                match = self._PATH_EXPIRE_PATTERN.search(parsed.path)
+                if match:
+                    expire_ts = int(match.group(1))
+        except (ValueError, TypeError):
+            expire_ts = None
+
+        if expire_ts is None:
+            return time.time() + self.default_ttl_s
+
+        return expire_ts - self.safety_margin_s
@@ -0,0 +1,192 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from models.track import Track, occurrence_keys
+from utils.validators import KIND_VIDEO, canonical_key, extract_video_id
+
+# Result of comparing a cached track list with a freshly extracted one
+class TrackDiff(NamedTuple):
+    added: List[Track]
+    removed: List[Track]
+    reordered: bool
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.reordered)
+
+
+def diff_tracks(old_tracks: List[Track], new_tracks: List[Track]) -> TrackDiff:
+    # Occurrence keys, so a video that appears twice is not collapsed into one entry
+    old_order = occurrence_keys(old_tracks)
+    new_order = occurrence_keys(new_tracks)
+    old_keys = set(old_order)
+    new_keys = set(new_order)
+
+    added = [t for t, k in zip(new_tracks, new_order) if k not in old_keys]
+    removed = [t for t, k in zip(old_tracks, old_order) if k not in new_keys]
+
+    kept_old_order = [k for k in old_order if k in new_keys]
+    kept_new_order = [k for k in new_order if k in old_keys]
+
+    return TrackDiff(added, removed, kept_old_order != kept_new_order)
+
+
+# Persistent SQLite cache of playlist entries, keyed by canonical playlist ID
+# Lets the UI render a playlist instantly while a background refresh fetches the current version
+# Tracks when each playlist was last fetched and last opened
+# Stores per-track metadata (video ID, duration, thumbnail) and fills in durations found later
+# A single connection is shared across threads and serialized with a lock
+class TrackCache:
+    # Columns added after the first schema; older databases are migrated in place
+    TRACK_COLUMNS = {
+        "duration": "INTEGER",
+        "video_id": "TEXT",
+        "thumbnail": "TEXT",
+    }
+
+    def __init__(self, db_path: str = "cache/tracks.db"):
+        self.db_path = os.path.abspath(db_path)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS playlists (
+                    playlist_id TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL,
+                    last_opened_at REAL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS playlist_tracks (
+                    playlist_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    title TEXT NOT NULL,
+                    artist TEXT,
+                    url TEXT NOT NULL,
+                    PRIMARY KEY (playlist_id, position)
+                )
+                """
+            )
+
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(playlist_tracks)")}
+            for column, column_type in self.TRACK_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE playlist_tracks ADD COLUMN {column} {column_type}")
+
+            # Rows written before video_id was stored get it from their URL, so durations can be applied by ID
+            missing = self._conn.execute(
+                "SELECT rowid, url FROM playlist_tracks WHERE video_id IS NULL"
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE playlist_tracks SET video_id = ? WHERE rowid = ?",
+                [(extract_video_id(url), rowid) for rowid, url in missing if extract_video_id(url)]
+            )
+
+            self._conn.execute("DROP INDEX IF EXISTS idx_playlist_tracks_url")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_playlist_tracks_video_id ON playlist_tracks (video_id)")
+
+    def get_tracks(self, playlist_id: str) -> Optional[List[Track]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM playlists WHERE playlist_id = ?",
+                (playlist_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            rows = self._conn.execute(
+                """
+                SELECT title, artist, url, duration, video_id, thumbnail
+                FROM playlist_tracks WHERE playlist_id = ? ORDER BY position
+                """,
+                (playlist_id,)
+            ).fetchall()
+
+        return [
+            Track(
+                title=title,
+                artist=artist,
+                url=url,
+                duration=duration,
+                video_id=video_id or extract_video_id(url),
+                thumbnail=thumbnail
+            )
+            for title, artist, url, duration, video_id, thumbnail in rows
+        ]
+
+    def save_tracks(self, playlist_id: str, tracks: List[Track]):
+        now = time.time()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO playlists (playlist_id, fetched_at) VALUES (?, ?)
+                ON CONFLICT(playlist_id) DO UPDATE SET fetched_at = excluded.fetched_at
+                """,
+                (playlist_id, now)
+            )
+            # Keep durations found earlier by the enricher for tracks the new extraction has none for
+            known_durations = {
+                (KIND_VIDEO, video_id) if video_id else canonical_key(url): duration
+                for url, video_id, duration in self._conn.execute(
+                    "SELECT url, video_id, duration FROM playlist_tracks WHERE playlist_id = ? AND duration IS NOT NULL",
+                    (playlist_id,)
+                )
+            }
+
+            self._conn.execute("DELETE FROM playlist_tracks WHERE playlist_id = ?", (playlist_id,))
+            self._conn.executemany(
+                """
+                INSERT INTO playlist_tracks (playlist_id, position, title, artist, url, duration, video_id, thumbnail)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (playlist_id, i, t.title, t.artist, t.url, t.duration or known_durations.get(t.key), t.video_id or extract_video_id(t.url), t.thumbnail)
+                    for i, t in enumerate(tracks)
+                ]
+            )
+
+    def update_durations(self, durations: Dict[Tuple[str, str], int]):
+        # durations: Track.key -> seconds; applied by video ID to every playlist containing the track
+        rows = [(duration, video_id) for (kind, video_id), duration in durations.items() if kind == KIND_VIDEO]
+        if not rows:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE playlist_tracks SET duration = ? WHERE video_id = ?", rows)
+
+    def get_playlist_times(self) -> Dict[str, Tuple[float, Optional[float]]]:
+        # playlist_id -> (fetched_at, last_opened_at) for every cached playlist
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT playlist_id, fetched_at, last_opened_at FROM playlists"
+            ).fetchall()
+
+        return {playlist_id: (fetched_at, last_opened_at) for playlist_id, fetched_at, last_opened_at in rows}
+
+    def touch(self, playlist_id: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE playlists SET last_opened_at = ? WHERE playlist_id = ?",
+                (time.time(), playlist_id)
+            )
+
+    def invalidate(self, playlist_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM playlist_tracks WHERE playlist_id = ?", (playlist_id,))
+            self._conn.execute("DELETE FROM playlists WHERE playlist_id = ?", (playlist_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,178 @@
+import threading
+import time
+from contextlib import contextmanager
+from yt_dlp import YoutubeDL
+
+# Pool of long-lived YoutubeDL instances shared by the player and the YouTube service
+# Instances are keyed by their options, so each option set keeps its own extractors, cookies and HTTP sessions
+# Reusing an instance avoids re-initialising extractors and re-doing TLS handshakes on every call
+# YoutubeDL is not thread-safe: each instance is checked out by one caller at a time
+# Bounded both per option set and in total; idle instances of other option sets are evicted (LRU) to make room
+# extract_info() and iter_entries() are the extraction interface shared with the process-pool backend
+class YdlPool:
+    MAX_URL_REDIRECTS = 3
+
+    def __init__(self, max_instances: int = 6, max_per_key: int = 2, factory=YoutubeDL):
+        self.max_instances = max_instances
+        self.max_per_key = max_per_key
+        self.factory = factory
+
+        self._slots = {}
+        self._cond = threading.Condition()
+
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    @property
+    def playlist_slots(self) -> int:
+        # How many extractions with the same options (e.g. flat playlist loads) can run at once
+        return max(1, min(self.max_per_key, self.max_instances))
+
+    def extract_info(self, opts: dict, url: str, download: bool = False, process: bool = True) -> dict:
+        with self.checkout(opts) as ydl:
+            return ydl.extract_info(url, download=download, process=process)
+
+    def iter_entries(self, opts: dict, url: str):
+        # Lazily yields playlist entries; the instance stays checked out until the generator is exhausted or closed
+        with self.checkout(opts) as ydl:
+            yield from iter_playlist_entries(ydl, url, self.MAX_URL_REDIRECTS)
+
+    @contextmanager
+    def checkout(self, opts: dict):
+        # For callers that need the instance for longer than one call (e.g. lazy playlist iteration)
+        slot = self._acquire(opts)
+        try:
+            yield slot.ydl
+        finally:
+            self._release(slot)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "instances": self._total(),
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted,
+            }
+
+    def close(self):
+        with self._cond:
+            slots = [slot for key_slots in self._slots.values() for slot in key_slots]
+            self._slots.clear()
+
+        for slot in slots:
+            self._close_instance(slot.ydl)
+
+    def _acquire(self, opts: dict):
+        key = self._make_key(opts)
+
+        with self._cond:
+            while True:
+                key_slots = self._slots.setdefault(key, [])
+
+                for slot in key_slots:
+                    if not slot.busy:
+                        slot.busy = True
+                        self.reused += 1
+                        return slot
+
+                if len(key_slots) < self.max_per_key:
+                    if self._total() >= self.max_instances:
+                        self._evict_idle(exclude_key=key)
+
+                    if self._total() < self.max_instances:
+                        slot = _PoolSlot(key)
+                        key_slots.append(slot)
+                        break
+
+                self._cond.wait()
+
+        # Building a YoutubeDL is the expensive part; do it without holding the pool lock
+        try:
+            slot.ydl = self.factory(dict(opts))
+        except Exception:
+            with self._cond:
+                self._slots.get(key, []).remove(slot)
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self.created += 1
+
+        return slot
+
+    def _release(self, slot):
+        with self._cond:
+            slot.busy = False
+            slot.last_used = time.monotonic()
+            self._cond.notify_all()
+
+    def _evict_idle(self, exclude_key):
+        idle = [
+            slot
+            for key, key_slots in self._slots.items()
+            if key != exclude_key
+            for slot in key_slots
+            if not slot.busy
+        ]
+        if not idle:
+            return
+
+        victim = min(idle, key=lambda s: s.last_used)
+        self._slots[victim.key].remove(victim)
+        if not self._slots[victim.key]:
+            del self._slots[victim.key]
+
+        self.evicted += 1
+        self._close_instance(victim.ydl)
+
+    def _total(self) -> int:
+        return sum(len(key_slots) for key_slots in self._slots.values())
+
+    def _make_key(self, opts: dict):
+        return tuple(sorted((k, repr(v)) for k, v in opts.items()))
+
+    def _close_instance(self, ydl):
+        close = getattr(ydl, "close", None)
+        if close is None:
+            return
+
+        try:
+            close()
+        except Exception:
+            pass
+
+
+class _PoolSlot:
+    def __init__(self, key):
+        self.key = key
+        self.ydl = None
+        self.busy = True
+        self.last_used = time.monotonic()
+
+
+def iter_playlist_entries(ydl, url: str, max_redirects: int = 3):
+    # process=False keeps "entries" lazy, so pages are fetched only as they are consumed
+    info = ydl.extract_info(url, download=False, process=False)
+
+    for _ in range(max_redirects):
+        if not isinstance(info, dict) or info.get("_type") not in ("url", "url_transparent"):
+            break
+        info = ydl.extract_info(info["url"], download=False, process=False)
+
+    entries = info.get("entries") if isinstance(info, dict) else None
+    yield from entries or []
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool() -> YdlPool:
+    global _shared_pool
+
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = YdlPool()
+        return _shared_pool
@@ -1,92 +1,336 @@
-from typing import List, Optional
-from yt_dlp import YoutubeDL
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from core.circuit_breaker import CircuitBreaker, get_shared_circuit_breaker
+from core.job_scheduler import CancelToken, JobCancelled
+from core.negative_cache import NegativeCache, classify_extraction_error, is_transient_error
+from core.single_flight import SingleFlight, get_shared_single_flight
+from core.ydl_pool import YdlPool, get_shared_pool
 from models.track import Track
+from utils.validators import KIND_PLAYLIST, canonical_key, extract_video_id
 
 
 # Service to interact with YouTube using yt-dlp (Python lib)
 # Fetches tracks from a YouTube playlist URL
+# Can also stream a playlist as Track batches while yt-dlp produces the entries
 # Searches for the first track matching a query
-# Parses extracted info to create Track objects
+# Resolves many search queries at once with bounded concurrency, de-duplicated and TTL-cached
+# Parses extracted info to create Track objects, keeping video ID, duration and thumbnail when present
+# Looks up missing durations per video, in bounded-concurrency batches
 # Handles errors gracefully, returning None or empty lists as needed
+# Runs extractions on pooled YoutubeDL instances shared with the audio player
+# Playlist loads accept a cancellation token, checked between entries, so superseded loads stop early
+# Concurrent full playlist loads and searches for the same key share one in-flight extraction
+# All extractions go through the global circuit breaker shared with the audio player
+# Duration lookups skip videos in the (optional) negative cache and record newly found unplayable ones
 class YouTubeService:
-    def __init__(self):
+    FIRST_BATCH_SIZE = 25
+    BATCH_SIZE = 200
+    SEARCH_WORKERS = 4
+    SEARCH_CACHE_TTL_S = 6 * 3600
+    SEARCH_CACHE_MAX_ENTRIES = 2000
+    DURATION_WORKERS = 4
+
+    def __init__(
+        self,
+        ydl_pool: YdlPool | None = None,
+        single_flight: SingleFlight | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        negative_cache: NegativeCache | None = None
+    ):
+        self._ydl_pool = ydl_pool if ydl_pool is not None else get_shared_pool()
+        self._single_flight = single_flight if single_flight is not None else get_shared_single_flight()
+        self._circuit_breaker = circuit_breaker if circuit_breaker is not None else get_shared_circuit_breaker()
+        self.negative_cache = negative_cache
         self._base_opts = {
             "quiet": True,
             "no_warnings": True,
             "skip_download": True,
         }
 
-    def get_tracks_from_playlist(self, playlist_url: str) -> List[Track]:
+        # (normalized query, full) -> (expires_at, Track or None)
+        self._search_cache = OrderedDict()
+        self._search_lock = threading.Lock()
+
+    @property
+    def playlist_slots(self) -> int:
+        # Playlist loads that can be extracted concurrently; any more wait for a free YoutubeDL instance or worker
+        return self._ydl_pool.playlist_slots
+
+    def get_tracks_from_playlist(self, playlist_url: str, cancel_token: Optional[CancelToken] = None) -> List[Track]:
+        flight_key = canonical_key(playlist_url, KIND_PLAYLIST)
+
+        while True:
+            try:
+                # Each caller gets its own list; the Track objects themselves are shared
+                return list(self._single_flight.do(flight_key, self._collect_playlist_tracks, playlist_url, cancel_token))
+
+            except JobCancelled:
+                # The shared call may have been cancelled by another caller's token; only give up for our own
+                if cancel_token is not None and cancel_token.cancelled:
+                    return []
+
+            except Exception:
+                return []
+
+    def _collect_playlist_tracks(self, playlist_url: str, cancel_token: Optional[CancelToken]) -> List[Track]:
+        tracks: List[Track] = []
+
+        for batch in self.iter_playlist_batches(playlist_url, cancel_token=cancel_token):
+            tracks.extend(batch)
+
+        return tracks
+
+    # Unlike the other methods, extraction errors propagate to the caller,
+    # so a partially streamed playlist can be told apart from a complete one
+    # Raises JobCancelled once the token is cancelled
+    def iter_playlist_batches(self, playlist_url: str, cancel_token: Optional[CancelToken] = None) -> Iterator[List[Track]]:
         ydl_opts = {
             **self._base_opts,
             "extract_flat": True,
             "noplaylist": False,
         }
 
-        try:
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(playlist_url, download=False)
+        self._circuit_breaker.before_call()
+        entries = self._ydl_pool.iter_entries(ydl_opts, playlist_url)
+        outcome_recorded = False
 
-            entries = info.get("entries") or []
-            tracks: List[Track] = []
+        try:
+            batch: List[Track] = []
+            batch_size = self.FIRST_BATCH_SIZE
 
             for e in entries:
-                if not isinstance(e, dict):
-                    continue
+                self._check_cancelled(cancel_token)
 
-                title = e.get("title")
-                video_id = e.get("id")
-                if not title or not video_id:
-                    continue
+                track = self._parse_entry(e)
+                if track:
+                    batch.append(track)
 
-                artist = e.get("artist") or e.get("uploader") or e.get("channel")
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+                    batch_size = self.BATCH_SIZE
 
-                tracks.append(
-                    Track(
-                        title=title,
-                        artist=artist,
-                        url=f"https://music.youtube.com/watch?v={video_id}",
-                    )
-                )
+            if batch:
+                yield batch
 
-            return tracks
+            self._circuit_breaker.record_success()
+            outcome_recorded = True
 
-        except Exception:
-            return []
+        except JobCancelled:
+            raise
 
-    def search_first(self, query: str) -> Optional[Track]:
-        ydl_opts = {
-            **self._base_opts,
-            "noplaylist": True,
-            "default_search": "ytsearch1",
-            "extract_flat": False,
-        }
+        except Exception as e:
+            if is_transient_error(e):
+                self._circuit_breaker.record_failure()
+            else:
+                self._circuit_breaker.record_success()
+            outcome_recorded = True
+            raise
+
+        finally:
+            if not outcome_recorded:
+                self._circuit_breaker.abandon()
+
+            # Returns the pooled instance right away when the consumer stops early
+            entries.close()
+
+    def _check_cancelled(self, cancel_token: Optional[CancelToken]):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+    def _parse_entry(self, e) -> Optional[Track]:
+        if not isinstance(e, dict):
+            return None
+
+        title = e.get("title")
+        video_id = e.get("id")
+        if not title or not video_id:
+            return None
+
+        artist = e.get("artist") or e.get("uploader") or e.get("channel")
+
+        return Track(
+            title=title,
+            artist=artist,
+            url=f"https://music.youtube.com/watch?v={video_id}",
+            duration=self._parse_duration(e.get("duration")),
+            video_id=video_id,
+            thumbnail=self._parse_thumbnail(e),
+        )
 
+    def _parse_duration(self, value) -> Optional[int]:
         try:
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(f"ytsearch1:{query}", download=False)
+            duration = int(round(float(value)))
+        except (TypeError, ValueError):
+            return None
+
+        return duration if duration > 0 else None
+
+    def _parse_thumbnail(self, e: dict) -> Optional[str]:
+        thumbnail = e.get("thumbnail")
+        if isinstance(thumbnail, str) and thumbnail:
+            return thumbnail
+
+        # Flat entries only carry a list; yt-dlp orders it from smallest to largest
+        thumbnails = e.get("thumbnails")
+        if isinstance(thumbnails, list):
+            for t in reversed(thumbnails):
+                if isinstance(t, dict) and t.get("url"):
+                    return t["url"]
+
+        return None
 
-            entries = info.get("entries") if isinstance(info, dict) else None
-            if not entries:
+    # Returns {Track.key: duration in seconds} for the tracks whose duration could be found
+    def get_durations(
+        self,
+        tracks: List[Track],
+        cancel_token: Optional[CancelToken] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[Tuple[str, str], int]:
+        if not tracks:
+            return {}
+
+        def lookup(track):
+            if cancel_token is not None and cancel_token.cancelled:
                 return None
 
-            data = entries[0]
-            if not isinstance(data, dict):
+            video_id = track.video_id or extract_video_id(track.url)
+            if self.negative_cache is not None and self.negative_cache.is_bad(video_id):
                 return None
 
-            title = data.get("title")
-            video_id = data.get("id")
-            if not title or not video_id:
+            flight_key = ("video-info", track.key)
+            try:
+                return self._single_flight.do(flight_key, self._extract_duration, track.url)
+            except Exception:
                 return None
 
-            artist = data.get("artist") or data.get("uploader") or data.get("channel")
+        workers = max(1, min(max_workers or self.DURATION_WORKERS, len(tracks)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yt-duration") as executor:
+            durations = list(executor.map(lookup, tracks))
+
+        self._check_cancelled(cancel_token)
+
+        return {track.key: duration for track, duration in zip(tracks, durations) if duration}
 
-            return Track(
-                title=title,
-                artist=artist,
-                url=f"https://music.youtube.com/watch?v={video_id}",
+    def _extract_duration(self, video_url: str) -> Optional[int]:
+        ydl_opts = {
+            **self._base_opts,
+            "noplaylist": True,
+        }
+
+        try:
+            # process=False skips format sorting; the extractor result already has the duration
+            info = self._circuit_breaker.call(
+                self._ydl_pool.extract_info,
+                ydl_opts,
+                video_url,
+                process=False,
+                is_failure=is_transient_error
             )
+        except Exception as e:
+            reason = classify_extraction_error(e)
+            if reason and self.negative_cache is not None:
+                self.negative_cache.mark_bad(extract_video_id(video_url), reason)
+            raise
+
+        return self._parse_duration(info.get("duration")) if isinstance(info, dict) else None
+
+    def search_first(self, query: str) -> Optional[Track]:
+        return self._search(query, full=True)
+
+    # Returns one result per query, in input order (None where nothing was found)
+    # full=False uses flat extraction, which is much faster but only guarantees title, id and channel
+    def search_many(self, queries: List[str], full: bool = False, max_workers: Optional[int] = None) -> List[Optional[Track]]:
+        normalized = [self._normalize_query(q) for q in queries]
+        unique = [q for q in dict.fromkeys(normalized) if q]
 
+        results = {}
+        missing = []
+
+        for query in unique:
+            hit, track = self._search_cache_get(query, full)
+            if hit:
+                results[query] = track
+            else:
+                missing.append(query)
+
+        if missing:
+            workers = max(1, min(max_workers or self.SEARCH_WORKERS, len(missing)))
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="yt-search") as executor:
+                for query, track in zip(missing, executor.map(lambda q: self._search(q, full), missing)):
+                    results[query] = track
+
+        return [results.get(query) for query in normalized]
+
+    def _search(self, query: str, full: bool) -> Optional[Track]:
+        query = self._normalize_query(query)
+        if not query:
+            return None
+
+        hit, track = self._search_cache_get(query, full)
+        if hit:
+            return track
+
+        try:
+            track = self._single_flight.do(("search", query, full), self._extract_search, query, full)
         except Exception:
+            # Not cached: a failed search may well succeed on the next attempt
             return None
+
+        self._search_cache_put(query, full, track)
+        return track
+
+    def _extract_search(self, query: str, full: bool) -> Optional[Track]:
+        ydl_opts = {
+            **self._base_opts,
+            "noplaylist": True,
+            "default_search": "ytsearch1",
+            "extract_flat": False if full else "in_playlist",
+        }
+
+        info = self._circuit_breaker.call(
+            self._ydl_pool.extract_info,
+            ydl_opts,
+            f"ytsearch1:{query}",
+            is_failure=is_transient_error
+        )
+
+        entries = info.get("entries") if isinstance(info, dict) else None
+        return self._parse_entry(entries[0]) if entries else None
+
+    def _normalize_query(self, query: str) -> str:
+        return " ".join((query or "").split()).casefold()
+
+    def _search_cache_get(self, query: str, full: bool):
+        now = time.monotonic()
+
+        with self._search_lock:
+            # A full result also answers a flat lookup
+            for key in ((query, full), (query, True)):
+                entry = self._search_cache.get(key)
+                if entry is None:
+                    continue
+
+                expires_at, track = entry
+                if expires_at <= now:
+                    del self._search_cache[key]
+                    continue
+
+                self._search_cache.move_to_end(key)
+                return True, track
+
+        return False, None
+
+    def _search_cache_put(self, query: str, full: bool, track: Optional[Track]):
+        with self._search_lock:
+            self._search_cache[(query, full)] = (time.monotonic() + self.SEARCH_CACHE_TTL_S, track)
+            self._search_cache.move_to_end((query, full))
+
+            while len(self._search_cache) > self.SEARCH_CACHE_MAX_ENTRIES:
+                self._search_cache.popitem(last=False)
@@ -1,16 +1,40 @@
+from utils.validators import KIND_VIDEO, canonical_key
+
 # Model representing a track with title and URL
+# Optionally carries the video ID, duration (seconds) and thumbnail URL from extraction
 # Provides methods to convert to/from dict for CSV/JSON storage
+# `key` is the canonical (kind, id) identity used for comparisons, so URL variants of one video are equal
 class Track:
-    def __init__(self, title: str, url: str, artist: str | None = None):
+    def __init__(
+        self,
+        title: str,
+        url: str,
+        artist: str | None = None,
+        duration: int | None = None,
+        video_id: str | None = None,
+        thumbnail: str | None = None
+    ):
         self.title = title
         self.artist = artist if artist else "Unknown Artist"
         self.url = url
+        self.duration = duration
+        self.video_id = video_id
+        self.thumbnail = thumbnail
+
+    @property
+    def key(self) -> tuple[str, str]:
+        if self.video_id:
+            return (KIND_VIDEO, self.video_id)
+        return canonical_key(self.url)
 
     def to_dict(self):
         return {
             "title": self.title,
             "artist": self.artist,
-            "url": self.url
+            "url": self.url,
+            "duration": self.duration,
+            "video_id": self.video_id,
+            "thumbnail": self.thumbnail
         }
 
     @classmethod
@@ -18,5 +42,23 @@ class Track:
         return cls(
             title=data["title"],
             artist=data.get("artist"),
-            url=data["url"]
+            url=data["url"],
+            duration=data.get("duration"),
+            video_id=data.get("video_id"),
+            thumbnail=data.get("thumbnail")
         )
+
+
+# (key, n) for the n-th occurrence of each key, in list order
+# A playlist can hold the same video more than once; these stay unique where Track.key does not
+def occurrence_keys(tracks) -> list[tuple[tuple[str, str], int]]:
+    seen = {}
+    keys = []
+
+    for track in tracks:
+        key = track.key
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        keys.append((key, n))
+
+    return keys
@@ -1,10 +1,23 @@
 import customtkinter as ctk
-import threading
 
 from core.csv_service import CSVService
+from core.journal_store import JournalPlaylistStore
+from core.sqlite_store import SQLitePlaylistStore, migrate_csv_to_sqlite
 from core.yt_service import YouTubeService
 from core.audio_player import AudioPlayer, PlayerState
+from core.audio_cache import AudioDiskCache
+from core.play_trace import PlayTracer
+from core.format_selector import FormatSelector, QualityProfile
+from core.job_scheduler import JobScheduler
+from core.negative_cache import NegativeCache
+from core.process_extractor import ProcessExtractor
+from core.ydl_pool import get_shared_pool
 from core.queue_manager import QueueManager
+from core.prefetcher import StreamPrefetcher
+from core.playlist_warmup import PlaylistWarmup
+from core.duration_enricher import DurationEnricher
+from core.track_cache import TrackCache, diff_tracks
+from utils.validators import KIND_PLAYLIST, canonical_key
 
 from ui.playlist_sidebar import PlaylistSidebar
 from ui.track_list import TrackList
@@ -15,10 +28,43 @@ from ui.theme import BG
 # Integrates playlist sidebar, track list, and player controls
 # Manages state of audio player and track queue
 # Handles user interactions for playing, pausing, navigating tracks, and shuffling
-# Uses threading to load tracks without blocking the UI
+# Loads tracks on a bounded background job scheduler without blocking the UI
+# A newer playlist load supersedes (cancels) the one still running
+# Background results are delivered to Tk in batches by a single after() pump
 # Responds to track completion events to autoplay next track
-# Coordinates between CSV service, YouTube service, audio player, and queue manager
+# Coordinates between playlist store, YouTube service, audio player, and queue manager
+# Playlists are stored in the CSV file or, optionally, in an append-only journal or a SQLite database seeded from it
+# Pre-resolves stream URLs of the next tracks in the queue while the current one plays
+# Preloads the next track on the player's standby slot for gapless (or crossfaded) transitions
+# Keeps played tracks in a size-bounded disk cache so replays start instantly and work offline
+# Traces time-to-first-audio of every play and dumps the latency percentiles on close
+# Renders cached playlist tracks instantly and applies only the diff from a background refresh
+# Streams uncached playlists into the queue and track list batch by batch
+# Fills in missing track durations in the background, for the duration column and total playlist length
+# Optionally runs yt-dlp extraction in worker processes, so parsing does not stall the UI thread
+# Optionally warms the track cache with every saved playlist (or the most recently opened) at startup
 class MainWindow(ctk.CTk):
+    PREFETCH_DEPTH = 2
+    CROSSFADE_MS = 0
+    AUDIO_CACHE_DIR = "cache/audio"
+    AUDIO_CACHE_MAX_BYTES = 2 * 1024 ** 3
+    AUDIO_CACHE_POLICY = "lru"
+    PLAY_TRACE_LOG = "logs/play_trace.jsonl"
+    QUALITY_PROFILE = QualityProfile.BALANCED
+    FAST_START = False
+    TRACK_CACHE_DB = "cache/tracks.db"
+    JOB_WORKERS = 3
+    JOB_PUMP_INTERVAL_MS = 30
+    PLAYLIST_LOAD_JOB = "playlist-load"
+    PLAYLIST_CSV = "playlists.csv"
+    PLAYLIST_JOURNAL = "playlists.journal"
+    PLAYLIST_DB = "playlists.db"
+    PLAYLIST_STORAGE = "csv"
+    WARMUP_ENABLED = False
+    WARMUP_LIMIT = None
+    WARMUP_CONCURRENCY = 2
+    EXTRACTION_PROCESSES = 0
+
     def __init__(self):
         super().__init__()
         self.minsize(1350, 650)
@@ -31,19 +77,83 @@ class MainWindow(ctk.CTk):
         self.title("Mirinoi Player")
         self.after(10, self._maximize)
 
-        self.csv_service = CSVService("playlists.csv")
-        self.yt_service = YouTubeService()
-        self.audio_player = AudioPlayer()
+        self.job_scheduler = JobScheduler(max_workers=self.JOB_WORKERS)
+        self.playlist_store = self._create_playlist_store()
+        self.extractor = self._create_extractor()
+        self.negative_cache = NegativeCache()
+        self.yt_service = YouTubeService(ydl_pool=self.extractor, negative_cache=self.negative_cache)
+        self.track_cache = TrackCache(self.TRACK_CACHE_DB)
+        self.audio_cache = AudioDiskCache(
+            self.AUDIO_CACHE_DIR,
+            max_bytes=self.AUDIO_CACHE_MAX_BYTES,
+            policy=self.AUDIO_CACHE_POLICY
+        )
+        self.play_tracer = PlayTracer(self.PLAY_TRACE_LOG)
+        self.audio_player = AudioPlayer(
+            crossfade_ms=self.CROSSFADE_MS,
+            ydl_pool=self.extractor,
+            audio_cache=self.audio_cache,
+            tracer=self.play_tracer,
+            format_selector=FormatSelector(self.QUALITY_PROFILE, fast_start=self.FAST_START),
+            negative_cache=self.negative_cache
+        )
         self.queue_manager = QueueManager()
+        self.playlist_warmup = PlaylistWarmup(
+            self.yt_service,
+            self.track_cache,
+            self.job_scheduler,
+            key_fn=self._playlist_cache_key,
+            concurrency=self.WARMUP_CONCURRENCY
+        )
+        self.prefetcher = StreamPrefetcher(
+            self.audio_player.resolve_stream_url,
+            depth=self.PREFETCH_DEPTH,
+            preload_callback=self.audio_player.preload
+        )
 
         self.audio_player.on_finished = self._on_track_finished
+        self.duration_enricher = DurationEnricher(self.yt_service, self.track_cache, self.job_scheduler)
+
+        self.queue_manager.on_changed = self._on_queue_changed
+        self.duration_enricher.on_batch = self._apply_durations
+        self.playlist_warmup.on_progress = self._on_warmup_progress
 
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         self._build_layout()
 
         self._playback_progress_update_job = None
+        self._last_playback_progress_view = None
+        self._current_playlist_key = None
+        self._playlist_load_token = None
+        self._job_pump_job = None
         self._schedule_playback_progress_updates()
+        self._pump_jobs()
+
+        if self.WARMUP_ENABLED:
+            self.playlist_warmup.start(self.playlist_store.load_playlists(), limit=self.WARMUP_LIMIT)
+
+    def _create_playlist_store(self):
+        # "journal" and "sqlite" import playlists.csv once and leave it untouched; export_csv() writes it back out
+        if self.PLAYLIST_STORAGE == "journal":
+            return JournalPlaylistStore(self.PLAYLIST_JOURNAL, seed_csv_path=self.PLAYLIST_CSV)
+
+        if self.PLAYLIST_STORAGE == "sqlite":
+            store = SQLitePlaylistStore(self.PLAYLIST_DB)
+            migrate_csv_to_sqlite(self.PLAYLIST_CSV, store)
+            return store
+
+        return CSVService(self.PLAYLIST_CSV)
+
+    def _create_extractor(self):
+        # 0 keeps extraction on threads (the shared YoutubeDL pool)
+        if self.EXTRACTION_PROCESSES <= 0:
+            return get_shared_pool()
+
+        try:
+            return ProcessExtractor(self.EXTRACTION_PROCESSES, warm_opts=[AudioPlayer.STREAM_YDL_OPTS])
+        except Exception:
+            return get_shared_pool()
 
     def _maximize(self):
         try:
@@ -57,7 +167,7 @@ class MainWindow(ctk.CTk):
 
         self.sidebar = PlaylistSidebar(
             self,
-            csv_service=self.csv_service,
+            playlist_store=self.playlist_store,
             on_select_callback=self._on_playlist_selected,
             on_remove_callback=self._on_playlist_removed
         )
@@ -84,33 +194,141 @@ class MainWindow(ctk.CTk):
 
         self.controls.grid(row=1, column=0, columnspan=2, sticky="ew")
 
+    def _playlist_cache_key(self, url):
+        return canonical_key(url, KIND_PLAYLIST)[1]
+
     def _on_playlist_selected(self, playlist):
         self._stop_player()
 
-        self.track_list.show_loading()
-        self.queue_manager.set_queue([])
+        playlist_key = self._playlist_cache_key(playlist.url)
+        self._current_playlist_key = playlist_key
+
+        cached_tracks = self.track_cache.get_tracks(playlist_key)
+
+        if cached_tracks is not None:
+            self.track_cache.touch(playlist_key)
+            self._update_tracks(playlist_key, cached_tracks)
+
+            self._playlist_load_token = self.job_scheduler.submit(
+                self._refresh_tracks_job,
+                playlist.url,
+                playlist_key,
+                key=self.PLAYLIST_LOAD_JOB
+            )
+        else:
+            self.track_list.show_loading()
+            self.queue_manager.set_queue([])
+
+            self._playlist_load_token = self.job_scheduler.submit(
+                self._stream_tracks_job,
+                playlist.url,
+                playlist_key,
+                key=self.PLAYLIST_LOAD_JOB
+            )
+
+    def _stream_tracks_job(self, cancel_token, url, playlist_key):
+        tracks = []
+        complete = False
+
+        try:
+            for batch in self.yt_service.iter_playlist_batches(url, cancel_token=cancel_token):
+                tracks.extend(batch)
+
+                # A batch yielded just before cancellation belongs to the superseded load
+                if cancel_token.cancelled:
+                    return
+                self.job_scheduler.post(self._append_tracks, cancel_token, playlist_key, batch)
+
+            complete = True
+        except Exception:
+            # Includes JobCancelled; a superseded load must not touch the UI
+            if cancel_token.cancelled:
+                return
+
+        # Only a fully streamed playlist is worth caching
+        if complete and tracks:
+            self.track_cache.save_tracks(playlist_key, tracks)
+            self.track_cache.touch(playlist_key)
+
+        if not cancel_token.cancelled:
+            self.job_scheduler.post(self._finish_tracks_loading, cancel_token, playlist_key)
+
+    def _refresh_tracks_job(self, cancel_token, url, playlist_key):
+        tracks = self.yt_service.get_tracks_from_playlist(url, cancel_token=cancel_token)
+
+        # An empty result usually means the extraction failed (or was cancelled); keep whatever is cached
+        if tracks and not cancel_token.cancelled:
+            self.track_cache.save_tracks(playlist_key, tracks)
+            self.track_cache.touch(playlist_key)
+            self.job_scheduler.post(self._apply_refreshed_tracks, cancel_token, playlist_key, tracks)
+
+    def _is_current_load(self, cancel_token, playlist_key):
+        # Callbacks already posted by a superseded load still get pumped; the playlist key alone cannot tell
+        # them apart when the same playlist (or another entry with the same list ID) is opened again
+        return (
+            cancel_token is self._playlist_load_token
+            and not cancel_token.cancelled
+            and playlist_key == self._current_playlist_key
+        )
+
+    def _append_tracks(self, cancel_token, playlist_key, tracks):
+        if not self._is_current_load(cancel_token, playlist_key):
+            return
+
+        self.queue_manager.extend(tracks)
+        self.track_list.append_tracks(tracks)
 
-        threading.Thread(
-            target=self._load_tracks_thread,
-            args=(playlist.url,),
-            daemon=True
-        ).start()
+    def _finish_tracks_loading(self, cancel_token, playlist_key):
+        if not self._is_current_load(cancel_token, playlist_key):
+            return
+
+        self.track_list.finish_loading()
+        self.duration_enricher.start(playlist_key, self.queue_manager.original_queue)
 
-    def _load_tracks_thread(self, url):
-        tracks = self.yt_service.get_tracks_from_playlist(url)
-        self.after(0, lambda: self._update_tracks(tracks))
+    def _update_tracks(self, playlist_key, tracks):
+        if playlist_key != self._current_playlist_key:
+            return
 
-    def _update_tracks(self, tracks):
         self.queue_manager.set_queue(tracks)
         self.track_list.load_tracks(tracks)
+        self.duration_enricher.start(playlist_key, tracks)
+
+    def _apply_refreshed_tracks(self, cancel_token, playlist_key, tracks):
+        if not self._is_current_load(cancel_token, playlist_key) or not tracks:
+            return
+
+        diff = diff_tracks(self.queue_manager.original_queue, tracks)
+        if not diff.changed:
+            return
+
+        self.queue_manager.apply_update(tracks, shuffled=self.shuffle_enabled)
+        self.track_list.patch_tracks(self.queue_manager.queue)
+        self.duration_enricher.start(playlist_key, tracks)
+
+    def _apply_durations(self, playlist_key, durations):
+        if playlist_key != self._current_playlist_key:
+            return
+
+        for track in self.queue_manager.original_queue:
+            if track.key in durations:
+                track.duration = durations[track.key]
+
+        self.track_list.update_durations(durations)
+
+    def _on_warmup_progress(self, done, total):
+        if total == 0 or done >= total:
+            self.sidebar.set_status("")
+            return
+
+        self.sidebar.set_status(f"Preparando playlists... {done}/{total}")
 
     def _on_track_selected(self, track):
         try:
-            idx = next(i for i, t in enumerate(self.queue_manager.queue) if t.url == track.url)
+            idx = next(i for i, t in enumerate(self.queue_manager.queue) if t.key == track.key)
         except StopIteration:
             return
 
-        self.queue_manager.current_index = idx
+        self.queue_manager.set_current_index(idx)
         self._force_play_current()
 
     def _play_current(self):
@@ -141,20 +359,25 @@ class MainWindow(ctk.CTk):
     def _stop_player(self):
         self.audio_player.stop()
         self.controls.update_playback_progress(0.0, 0, 0)
+        self._last_playback_progress_view = (0, 0, 0)
         self.controls.set_playing(False)
 
     def _play_next(self):
-        track = self.queue_manager.next()
+        # Skips tracks already known to be unplayable, at most one full pass over the queue
+        for _ in range(len(self.queue_manager.queue)):
+            track = self.queue_manager.next()
 
-        if not track:
-            if self.loop_enabled and self.queue_manager.queue:
-                self.queue_manager.current_index = 0
+            if not track:
+                if not (self.loop_enabled and self.queue_manager.queue):
+                    break
+                self.queue_manager.set_current_index(0)
+                track = self.queue_manager.current()
+
+            if not self.audio_player.is_known_unplayable(track.url):
                 self._force_play_current()
-            else:
-                self._stop_player()
-            return
+                return
 
-        self._force_play_current()
+        self._stop_player()
 
     def _play_prev(self):
         track = self.queue_manager.prev()
@@ -163,11 +386,15 @@ class MainWindow(ctk.CTk):
 
         self._force_play_current()
 
+    def _on_queue_changed(self):
+        upcoming = self.queue_manager.upcoming(self.PREFETCH_DEPTH, wrap=self.loop_enabled)
+        self.prefetcher.schedule([t.url for t in upcoming if not self.audio_player.is_known_unplayable(t.url)])
+
     def _on_track_finished(self):
         if self.audio_player.state != PlayerState.STOPPED:
             return
 
-        self.after(0, self._play_next)
+        self.job_scheduler.post(self._play_next)
 
     def _toggle_shuffle(self):
         self.shuffle_enabled = not self.shuffle_enabled
@@ -184,6 +411,10 @@ class MainWindow(ctk.CTk):
         self.controls.set_shuffle_active(self.shuffle_enabled)
 
     def _on_playlist_removed(self, playlist_id):
+        self._current_playlist_key = None
+        self._playlist_load_token = None
+        self.job_scheduler.cancel(self.PLAYLIST_LOAD_JOB)
+        self.duration_enricher.cancel()
         self._stop_player()
         self.queue_manager.set_queue([])
         self.track_list.load_tracks([])
@@ -195,12 +426,31 @@ class MainWindow(ctk.CTk):
             except Exception:
                 pass
 
+        if self._job_pump_job is not None:
+            try:
+                self.after_cancel(self._job_pump_job)
+            except Exception:
+                pass
+
+        self.playlist_warmup.cancel()
+        self.job_scheduler.shutdown()
+        self.prefetcher.shutdown()
         self._stop_player()
+        self.audio_player.close()
+
+        if isinstance(self.extractor, ProcessExtractor):
+            self.extractor.close()
+
+        self.play_tracer.dump()
+        self.play_tracer.close()
+        self.track_cache.close()
+        self.playlist_store.close()
         self.destroy()
 
     def _toggle_loop(self):
         self.loop_enabled = not self.loop_enabled
         self.controls.set_loop_active(self.loop_enabled)
+        self._on_queue_changed()
 
     def _on_play_pause(self):
         state = self.audio_player.state
@@ -224,26 +474,37 @@ class MainWindow(ctk.CTk):
     def _on_volume_change(self, value):
         self.audio_player.set_volume(int(value))
 
+    def _pump_jobs(self):
+        self.job_scheduler.pump()
+        self._job_pump_job = self.after(self.JOB_PUMP_INTERVAL_MS, self._pump_jobs)
+
     def _schedule_playback_progress_updates(self):
         self._update_playback_progress_ui()
 
     def _update_playback_progress_ui(self):
-        if self.audio_player.state in (PlayerState.PLAYING, PlayerState.PAUSED):
-            current_time_ms = self.audio_player.get_current_playback_time_ms()
-            track_duration_ms = self.audio_player.get_track_duration_ms()
-            progress_ratio = self.audio_player.get_playback_progress_ratio()
+        snapshot = self.audio_player.snapshot()
+        track_duration_ms = snapshot.track_duration_ms
+
+        # Until VLC reports a length, show the duration known from extraction
+        if not track_duration_ms:
+            current = self.queue_manager.current()
+            if current and current.duration and snapshot.state != PlayerState.STOPPED:
+                track_duration_ms = current.duration * 1000
+
+        # Only reconfigure widgets when something visible changed (slider step or displayed second)
+        view = (
+            round(snapshot.progress_ratio * 1000),
+            snapshot.current_time_ms // 1000,
+            track_duration_ms // 1000
+        )
 
+        if view != self._last_playback_progress_view:
+            self._last_playback_progress_view = view
             self.controls.update_playback_progress(
-                progress_ratio=progress_ratio,
-                current_time_ms=current_time_ms,
+                progress_ratio=snapshot.progress_ratio,
+                current_time_ms=snapshot.current_time_ms,
                 track_duration_ms=track_duration_ms
             )
-        else:
-            self.controls.update_playback_progress(
-                progress_ratio=0.0,
-                current_time_ms=0,
-                track_duration_ms=0
-            )
 
         self._playback_progress_update_job = self.after(200, self._update_playback_progress_ui)
 
@@ -1,22 +1,25 @@
 import unicodedata
 import customtkinter as ctk
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
+from core.playlist_import import export_playlists, import_playlists
 from ui.playlist_modal import PlaylistModal
 from ui.theme import SURFACE, SURFACE_2, SURFACE_HOVER, ACCENT, ACCENT_HOVER, TEXT, STROKE, DANGER_HOVER, TEXT_MUTED, SURFACE_3
 
 
 # Sidebar UI component for managing playlists
-# Displays list of playlists from CSV service
+# Displays list of playlists from the playlist store (any PlaylistStore backend)
 # Allows adding/removing playlists via modal dialog
+# Bulk imports playlists from a CSV/M3U/text file and exports them back
 # Calls callback on playlist selection
 # Highlights selected playlist
+# Shows a small status line for background work (e.g. playlist warm-up progress)
 class PlaylistSidebar(ctk.CTkFrame):
-    def __init__(self, parent, csv_service, on_select_callback=None, on_remove_callback=None):
+    def __init__(self, parent, playlist_store, on_select_callback=None, on_remove_callback=None):
         super().__init__(parent, width=220)
 
         self.configure(fg_color=SURFACE)
 
-        self.csv_service = csv_service
+        self.playlist_store = playlist_store
         self.on_select_callback = on_select_callback
         self.on_remove_callback = on_remove_callback
 
@@ -48,6 +51,13 @@ class PlaylistSidebar(ctk.CTkFrame):
         )
         self.title.pack(pady=(10, 6))
 
+        self.status_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=TEXT_MUTED
+        )
+
         self.search_row = ctk.CTkFrame(self, fg_color="transparent")
         self.search_row.pack(fill="x", padx=10, pady=(0, 8))
 
@@ -99,6 +109,35 @@ class PlaylistSidebar(ctk.CTkFrame):
         )
         self.btn_add.pack(fill="x", padx=10, pady=(5, 2))
 
+        self.bulk_row = ctk.CTkFrame(self, fg_color="transparent")
+        self.bulk_row.pack(fill="x", padx=10, pady=2)
+
+        self.btn_import = ctk.CTkButton(
+            self.bulk_row,
+            text="📥 Importar",
+            width=96,
+            command=self._import_playlists_dialog,
+            fg_color=SURFACE_2,
+            hover_color=SURFACE_HOVER,
+            text_color=TEXT,
+            border_width=1,
+            border_color=STROKE
+        )
+        self.btn_import.pack(side="left", fill="x", expand=True, padx=(0, 2))
+
+        self.btn_export = ctk.CTkButton(
+            self.bulk_row,
+            text="📤 Exportar",
+            width=96,
+            command=self._export_playlists_dialog,
+            fg_color=SURFACE_2,
+            hover_color=SURFACE_HOVER,
+            text_color=TEXT,
+            border_width=1,
+            border_color=STROKE
+        )
+        self.btn_export.pack(side="left", fill="x", expand=True, padx=(2, 0))
+
         self.btn_remove = ctk.CTkButton(
             self,
             text="❌ Remover",
@@ -111,6 +150,14 @@ class PlaylistSidebar(ctk.CTkFrame):
         )
         self.btn_remove.pack(fill="x", padx=10, pady=(2, 10))
 
+    def set_status(self, text: str):
+        self.status_label.configure(text=text)
+
+        if text:
+            self.status_label.pack(after=self.title, pady=(0, 6))
+        else:
+            self.status_label.pack_forget()
+
     def _apply_placeholder(self):
         if self.search_var.get().strip():
             return
@@ -132,7 +179,7 @@ class PlaylistSidebar(ctk.CTkFrame):
         self.search_entry.configure(text_color=TEXT)
 
     def _load_playlists(self):
-        self._all_playlists = self.csv_service.load_playlists()
+        self._all_playlists = self.playlist_store.load_playlists()
         self._apply_playlist_filter()
 
     def _apply_playlist_filter(self):
@@ -208,9 +255,57 @@ class PlaylistSidebar(ctk.CTkFrame):
 
         if result:
             name, url = result
-            self.csv_service.add_playlist(name, url)
+
+            existing = self.playlist_store.find_by_url(url)
+            if existing:
+                messagebox.showwarning("Atenção", f"Esta playlist já está salva como \"{existing.name}\".")
+                return
+
+            self.playlist_store.add_playlist(name, url)
             self._load_playlists()
 
+    def _import_playlists_dialog(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Importar playlists",
+            filetypes=[
+                ("Listas de playlists", "*.csv *.m3u *.m3u8 *.txt"),
+                ("Todos os arquivos", "*.*"),
+            ]
+        )
+        if not path:
+            return
+
+        try:
+            report = import_playlists(self.playlist_store, path)
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Importar Playlists", f"Não foi possível ler o arquivo:\n{e}")
+            return
+
+        self._load_playlists()
+
+        messagebox.showinfo(
+            "Importar Playlists",
+            f"{len(report.added)} playlist(s) importada(s).\n"
+            f"{report.duplicates} duplicada(s) ignorada(s).\n"
+            f"{report.invalid} linha(s) inválida(s)."
+        )
+
+    def _export_playlists_dialog(self):
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Exportar playlists",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("M3U", "*.m3u"), ("Texto", "*.txt")]
+        )
+        if not path:
+            return
+
+        try:
+            export_playlists(self.playlist_store, path)
+        except OSError as e:
+            messagebox.showerror("Exportar Playlists", f"Não foi possível salvar o arquivo:\n{e}")
+
     def _remove_selected_playlist(self):
         if not self.selected_playlist_id:
             messagebox.showwarning(
@@ -226,7 +321,7 @@ class PlaylistSidebar(ctk.CTkFrame):
 
         if confirm:
             removed_id = self.selected_playlist_id
-            self.csv_service.remove_playlist(removed_id)
+            self.playlist_store.remove_playlist(removed_id)
             self.selected_playlist_id = None
             self._load_playlists()
 
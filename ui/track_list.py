@@ -1,5 +1,7 @@
 import unicodedata
 import customtkinter as ctk
+from models.track import occurrence_keys
+from utils.validators import canonical_key
 from ui.theme import SURFACE, SURFACE_2, SURFACE_HOVER, ACCENT, ACCENT_HOVER, TEXT, STROKE, TEXT_MUTED, SURFACE_3
 
 
@@ -8,6 +10,7 @@ from ui.theme import SURFACE, SURFACE_2, SURFACE_HOVER, ACCENT, ACCENT_HOVER, TE
 # Calls a callback when a track is selected
 # Provides method to load tracks into the list
 # Allows setting highlight on a specific track
+# Shows each track's duration in a right-aligned column and the playlist's total length under the title
 class TrackList(ctk.CTkFrame):
     def __init__(self, parent, on_track_selected=None):
         super().__init__(parent)
@@ -30,7 +33,7 @@ class TrackList(ctk.CTkFrame):
         self._placeholder_text = "Pesquisar músicas..."
         self._placeholder_active = False
 
-        self._playing_track_url = None
+        self._playing_track_key = None
 
         self._build_ui()
 
@@ -47,7 +50,15 @@ class TrackList(ctk.CTkFrame):
             font=ctk.CTkFont(size=16, weight="bold"),
             text_color=TEXT
         )
-        self.title.pack(pady=(10, 6))
+        self.title.pack(pady=(10, 0))
+
+        self.summary_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=TEXT_MUTED
+        )
+        self.summary_label.pack(pady=(0, 6))
 
         self.search_row = ctk.CTkFrame(self, fg_color="transparent")
         self.search_row.pack(fill="x", padx=10, pady=(0, 8))
@@ -120,6 +131,7 @@ class TrackList(ctk.CTkFrame):
 
         self.track_buttons.clear()
         self.default_fg_color = None
+        self._update_summary()
 
         label = ctk.CTkLabel(
             self.scroll,
@@ -134,6 +146,116 @@ class TrackList(ctk.CTkFrame):
         self.search_var.set("")  
         self._apply_track_filter()
 
+    def append_tracks(self, tracks):
+        if not tracks:
+            return
+
+        start = len(self._all_tracks)
+        self._all_tracks = self._all_tracks + list(tracks)
+
+        raw = self.search_var.get()
+        filtering = raw.strip() and not self._placeholder_active and raw != self._placeholder_text
+        if filtering or not self.track_buttons:
+            self._apply_track_filter()
+            return
+
+        for offset, track in enumerate(tracks):
+            btn = self._create_track_button(start + offset, track)
+            btn.pack(fill="x", pady=2)
+            self.track_buttons.append(btn)
+
+        self.tracks = self._all_tracks
+        self._update_summary()
+
+        for offset, track in enumerate(tracks):
+            if self._playing_track_key and track.key == self._playing_track_key:
+                self.set_highlight(start + offset)
+                break
+
+    def finish_loading(self):
+        # Replaces the loading message when the playlist turned out to be empty
+        if not self._all_tracks:
+            self._apply_track_filter()
+
+    def patch_tracks(self, tracks):
+        # Applies an updated list without rebuilding rows that did not change
+        self._all_tracks = tracks or []
+
+        raw = self.search_var.get()
+        filtering = raw.strip() and not self._placeholder_active and raw != self._placeholder_text
+        if filtering or not self.track_buttons or not self._all_tracks:
+            self._apply_track_filter()
+            return
+
+        # Keyed per occurrence, so each copy of a repeated video reuses exactly one row
+        existing = dict(zip(occurrence_keys(self.tracks), self.track_buttons))
+
+        buttons = []
+        for index, (track, key) in enumerate(zip(self._all_tracks, occurrence_keys(self._all_tracks))):
+            btn = existing.pop(key, None)
+            if btn is None:
+                btn = self._create_track_button(index, track)
+            else:
+                self._configure_track_button(btn, index, track)
+                btn.pack_forget()
+
+            btn.pack(fill="x", pady=2)
+            buttons.append(btn)
+
+        for btn in existing.values():
+            btn.destroy()
+
+        self.tracks = self._all_tracks
+        self.track_buttons = buttons
+        self.selected_index = None
+        self.highlighted_index = None
+        self._update_summary()
+        self._apply_playing_highlight()
+
+    def update_durations(self, durations):
+        # durations: Track.key -> seconds, e.g. from the background duration enricher
+        for track in self._all_tracks:
+            if track.key in durations:
+                track.duration = durations[track.key]
+
+        for btn, track in zip(self.track_buttons, self.tracks):
+            btn.duration_label.configure(text=self._format_duration(track.duration))
+
+        self._update_summary()
+
+    def _update_summary(self):
+        tracks = self._all_tracks
+        if not tracks:
+            self.summary_label.configure(text="")
+            return
+
+        known = [t.duration for t in tracks if t.duration]
+        text = f"{len(tracks)} músicas"
+
+        if known:
+            text += f" • {self._format_total_duration(sum(known))}"
+            if len(known) < len(tracks):
+                text += " (parcial)"
+
+        self.summary_label.configure(text=text)
+
+    def _format_duration(self, seconds) -> str:
+        if not seconds:
+            return ""
+
+        hours, rest = divmod(int(seconds), 3600)
+        minutes, secs = divmod(rest, 60)
+        if hours:
+            return f"{hours}:{minutes:02d}:{secs:02d}"
+        return f"{minutes}:{secs:02d}"
+
+    def _format_total_duration(self, seconds: int) -> str:
+        hours, rest = divmod(int(seconds), 3600)
+        minutes = rest // 60
+        if hours:
+            return f"{hours} h {minutes} min"
+        return f"{minutes} min"
+
     def _apply_track_filter(self):
         raw = self.search_var.get()
         if self._placeholder_active or raw == self._placeholder_text:
@@ -151,6 +273,7 @@ class TrackList(ctk.CTkFrame):
                     filtered.append(t)
 
         self._render_tracks(filtered)
+        self._update_summary()
 
     def _render_tracks(self, tracks):
         self.tracks = tracks
@@ -174,37 +297,58 @@ class TrackList(ctk.CTkFrame):
             return
 
         for index, track in enumerate(tracks):
-            text = (
-                f"{index + 1}. {track.title} - {track.artist}"
-                if track.artist
-                else f"{index + 1}. {track.title}"
-            )
-
-            btn = ctk.CTkButton(
-                self.scroll,
-                text=text,
-                anchor="w",
-                command=lambda i=index: self._select_track(i),
-                fg_color=SURFACE_2,
-                hover_color=SURFACE_HOVER,
-                text_color=TEXT,
-                border_width=1,
-                border_color=STROKE
-            )
-
-            if self.default_fg_color is None:
-                self.default_fg_color = btn.cget("fg_color")
-
+            btn = self._create_track_button(index, track)
             btn.pack(fill="x", pady=2)
             self.track_buttons.append(btn)
         self._apply_playing_highlight()
 
+    def _format_track_text(self, index, track):
+        return (
+            f"{index + 1}. {track.title} - {track.artist}"
+            if track.artist
+            else f"{index + 1}. {track.title}"
+        )
+
+    def _create_track_button(self, index, track):
+        btn = ctk.CTkButton(
+            self.scroll,
+            anchor="w",
+            fg_color=SURFACE_2,
+            hover_color=SURFACE_HOVER,
+            text_color=TEXT,
+            border_width=1,
+            border_color=STROKE
+        )
+
+        btn.duration_label = ctk.CTkLabel(
+            btn,
+            text="",
+            fg_color=SURFACE_2,
+            text_color=TEXT_MUTED
+        )
+        btn.duration_label.place(relx=1.0, rely=0.5, x=-12, anchor="e")
+
+        self._configure_track_button(btn, index, track)
+
+        if self.default_fg_color is None:
+            self.default_fg_color = btn.cget("fg_color")
+
+        return btn
+
+    def _configure_track_button(self, btn, index, track):
+        btn.configure(
+            text=self._format_track_text(index, track),
+            command=lambda i=index: self._select_track(i)
+        )
+        btn.duration_label.configure(text=self._format_duration(track.duration))
+        btn.duration_label.bind("<Button-1>", lambda _e, i=index: self._select_track(i))
+
     def _apply_playing_highlight(self):
-        if not self._playing_track_url:
+        if not self._playing_track_key:
             return
 
         for i, t in enumerate(self.tracks):
-            if getattr(t, "url", None) == self._playing_track_url:
+            if getattr(t, "key", None) == self._playing_track_key:
                 self.set_highlight(i)
                 return
 
@@ -227,6 +371,7 @@ class TrackList(ctk.CTkFrame):
                     text_color=TEXT,
                     border_width=0
                 )
+                btn.duration_label.configure(fg_color=ACCENT, text_color=TEXT)
             else:
                 btn.configure(
                     fg_color=SURFACE_2,
@@ -235,9 +380,10 @@ class TrackList(ctk.CTkFrame):
                     border_width=1,
                     border_color=STROKE
                 )
+                btn.duration_label.configure(fg_color=SURFACE_2, text_color=TEXT_MUTED)
 
     def set_playing_track(self, track_url: str | None):
-        self._playing_track_url = track_url
+        self._playing_track_key = canonical_key(track_url) if track_url else None
         self._apply_playing_highlight()
 
     def _clear_search(self):
@@ -1,9 +1,20 @@
 # Utility functions for validating URLs and strings
+# Also reduces YouTube URLs to a canonical (kind, id) key, used by every cache, index and de-duplication
 import re
+from functools import lru_cache
+
+YOUTUBE_URL_RE = re.compile(r"^(https?://)?(www\.)?(youtube\.com|youtu\.be|music\.youtube\.com)/.+$")
+VIDEO_ID_RE = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})")
+PLAYLIST_ID_RE = re.compile(r"[?&]list=([A-Za-z0-9_-]+)")
+PLAYLIST_PAGE_RE = re.compile(r"/playlist(?:[/?#]|$)")
+
+KIND_VIDEO = "video"
+KIND_PLAYLIST = "playlist"
+KIND_URL = "url"
+
 
 def is_youtube_url(url: str) -> bool:
-    pattern = r"^(https?://)?(www\.)?(youtube\.com|youtu\.be|music\.youtube\.com)/.+$"
-    return re.match(pattern, url) is not None
+    return YOUTUBE_URL_RE.match(url) is not None
 
 
 def is_non_empty_string(value: str) -> bool:
@@ -11,4 +22,58 @@ def is_non_empty_string(value: str) -> bool:
 
 
 def is_valid_url(url: str) -> bool:
-    return is_youtube_url(url)
\ No newline at end of file
+    return is_youtube_url(url)
+
+
+def extract_video_id(url: str) -> str | None:
+    if not isinstance(url, str):
+        return None
+
+    match = VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def extract_playlist_id(url: str) -> str | None:
+    if not isinstance(url, str):
+        return None
+
+    match = PLAYLIST_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+# ("video", id) for watch/youtu.be/shorts/embed URLs on any YouTube host, ("playlist", id) for playlist pages
+# Tracking parameters (si=, feature=, t=...) and the host variant do not change the key
+# A watch URL with a list= parameter keys as its video, unless kind=KIND_PLAYLIST asks for the list
+# (playlist storage, where such a URL stands for the whole playlist)
+# Anything else falls back to ("url", stripped url)
+# Cached, because the same URLs are keyed over and over (highlighting, queue diffs, caches)
+@lru_cache(maxsize=65536)
+def canonical_key(url: str, kind: str | None = None) -> tuple[str, str]:
+    if not isinstance(url, str):
+        return (KIND_URL, "")
+
+    video_id = extract_video_id(url)
+    playlist_id = extract_playlist_id(url)
+
+    if kind == KIND_PLAYLIST or PLAYLIST_PAGE_RE.search(url):
+        if playlist_id:
+            return (KIND_PLAYLIST, playlist_id)
+
+    if video_id:
+        return (KIND_VIDEO, video_id)
+
+    if playlist_id:
+        return (KIND_PLAYLIST, playlist_id)
+
+    return (KIND_URL, url.strip())
+
+
+# Canonical URL for a key, e.g. to store or compare next to the original URL
+def canonical_url(url: str, kind: str | None = None) -> str:
+    key_kind, key_id = canonical_key(url, kind)
+
+    if key_kind == KIND_VIDEO:
+        return f"https://music.youtube.com/watch?v={key_id}"
+    if key_kind == KIND_PLAYLIST:
+        return f"https://www.youtube.com/playlist?list={key_id}"
+    return key_id